@@ -1,7 +1,8 @@
 from typing import Dict, Any, List, Optional
 import logging
+from concurrent.futures import ThreadPoolExecutor
 from project.libs.yelp_client import YelpClient
-from project.libs.google_client import GoogleClient
+from project.libs.google_client import get_default_client
 from project.libs.supabase_client import get_client, ensure_table_exists, _businesses_table_schema
 from datetime import datetime, timedelta, timezone
 from project.helpers.storage import StorageClient
@@ -14,7 +15,7 @@ class BusinessIntegrator:
 
     def __init__(self):
         self.yelp_client = YelpClient()
-        self.google_client = GoogleClient()
+        self.google_client = get_default_client()
         self.storage = StorageClient()
         # Table creation should be handled via migrations; removed runtime creation attempt
 
@@ -35,42 +36,46 @@ class BusinessIntegrator:
                 break
             yelp_results.extend(results)
 
-        enriched_results = []
-        for biz in yelp_results:
-            logging.info(f"Scraped business: {biz.get('name')} (id={biz.get('id')})")
-
-            # Guard: if business enrichment done within last 24h, skip details/enrichment
-            biz_id = biz.get("id")
-            if biz_id and self.storage.business_recently_updated(biz_id):
-                logging.info(f"Skipping enrichment for {biz_id}: updated within last 24 hours")
-                enriched_results.append({"yelp": biz, "google": {}})
-                continue
-
-            # Fetch full Yelp business details
+        if not yelp_results:
+            return []
+        # Each business is a chain of Yelp/Google round-trips; overlap them across a bounded pool
+        # (the Google client throttles itself, so parallel workers stay under quota). Order is kept.
+        with ThreadPoolExecutor(max_workers=min(self.google_client.max_workers, len(yelp_results)), thread_name_prefix="enrich") as executor:
+            return list(executor.map(self._enrich_business, yelp_results))
+
+    def _enrich_business(self, biz: Dict[str, Any]) -> Dict[str, Any]:
+        """Fetch Yelp details and Google place details for one scraped business."""
+        logging.info(f"Scraped business: {biz.get('name')} (id={biz.get('id')})")
+
+        # Guard: if business enrichment done within last 24h, skip details/enrichment
+        biz_id = biz.get("id")
+        if biz_id and self.storage.business_recently_updated(biz_id):
+            logging.info(f"Skipping enrichment for {biz_id}: updated within last 24 hours")
+            return {"yelp": biz, "google": {}}
+
+        # Fetch full Yelp business details
+        try:
+            yelp_details = self.yelp_client.get_business_details(biz["id"])
+        except Exception as e:
+            logging.error(f"Failed to fetch details for {biz.get('id')}: {e}")
+            yelp_details = biz  # fallback to minimal search result
+
+        google_info = self.google_client.search_place(biz["name"], "Charlotte, NC")
+        google_details = {}
+        if google_info:
+            google_details = self.google_client.get_place_details(google_info["place_id"])
+
+        # Touch businesses.updated_at since we just reprocessed enrichment for this biz_id
+        if biz_id:
             try:
-                yelp_details = self.yelp_client.get_business_details(biz["id"])
-            except Exception as e:
-                logging.error(f"Failed to fetch details for {biz.get('id')}: {e}")
-                yelp_details = biz  # fallback to minimal search result
-
-            google_info = self.google_client.search_place(biz["name"], "Charlotte, NC")
-            google_details = {}
-            if google_info:
-                google_details = self.google_client.get_place_details(google_info["place_id"])
-
-            # Touch businesses.updated_at since we just reprocessed enrichment for this biz_id
-            if biz_id:
-                try:
-                    self.storage.touch_business_updated_at(biz_id)
-                except Exception:
-                    pass
-
-            enriched_results.append({
-                "yelp": yelp_details,
-                "google": google_details
-            })
-
-        return enriched_results
+                self.storage.touch_business_updated_at(biz_id)
+            except Exception:
+                pass
+
+        return {
+            "yelp": yelp_details,
+            "google": google_details
+        }
 
 
 def merge_business_data(yelp_business: dict, google_business: Optional[dict] = None) -> dict:
@@ -13,7 +13,7 @@ from project.helpers.pagespeed import PageSpeedClient
 from project.helpers.storage import StorageClient
 from project.helpers.seo_analyzer import analyze_html
 from project.helpers.zoho_integration import update_lead_with_emails, create_contacts_for_emails, get_lead_id_by_business_id, add_or_update_emails_note
-from project.libs.openrouter_client import summarize_page as or_summarize_page, classify_page as or_classify_page
+from project.libs.openrouter_client import asummarize_page as or_asummarize_page, aclassify_page as or_aclassify_page
 
 
 class BusinessPipeline:
@@ -217,8 +217,9 @@ class BusinessPipeline:
                         recompute_ai = True
 
                 if recompute_ai:
-                    summary = or_summarize_page(url, words_only)
-                    page_type = or_classify_page(url, summary)
+                    # Awaited so other links' renders and LLM calls proceed during these round-trips
+                    summary = await or_asummarize_page(url, words_only)
+                    page_type = await or_aclassify_page(url, summary)
                     print("[DEBUG] Finished Content Enrichment (AI recomputed)")
                 else:
                     summary = existing.get("summary") if existing else None
@@ -1,95 +1,183 @@
 import logging
-from typing import Dict, Any, List, Optional, Tuple
+from typing import Dict, Any, List, Optional, Tuple, FrozenSet, Mapping
+from types import MappingProxyType
 from project.libs.zoho_client import get_zoho_client
 from project.libs.supabase_client import get_client
-import re
 import tempfile
+import shutil
 import os
 import mimetypes
+import atexit
+import functools
+import threading
+import time
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from concurrent.futures import ThreadPoolExecutor
 
 logger = logging.getLogger(__name__)
 
+# Shared session for image downloads so consecutive fetches reuse warm keep-alive connections
+_HTTP = requests.Session()
+_HTTP.mount('https://', HTTPAdapter(
+    pool_connections=16,
+    pool_maxsize=32,
+    max_retries=Retry(total=3, backoff_factor=0.3, status_forcelist=[429, 502, 503, 504]),
+))
+atexit.register(_HTTP.close)
+
+# Prefix identifying the lead note that carries collected emails
+_EMAILS_NOTE_PREFIX = 'Emails: '
+
+# Extensions for the image types business photos come in; avoids loading the mimetypes database
+_IMAGE_EXTENSIONS = {
+    'image/jpeg': '.jpg',
+    'image/jpg': '.jpg',
+    'image/png': '.png',
+    'image/webp': '.webp',
+    'image/gif': '.gif',
+    'image/heic': '.heic',
+}
+
+# Shared read-only stand-in for missing nested dicts, so lookups don't allocate a fresh {} per business
+_EMPTY: Mapping[str, Any] = MappingProxyType({})
+
+# Short-lived cache of attachment file names per lead: lead_id -> (fetched_at, names)
+_ATTACHMENT_INDEX_TTL_S = 60.0
+_attachment_index: Dict[str, Tuple[float, FrozenSet[str]]] = {}
+_attachment_index_lock = threading.Lock()
+
+# Short-lived cache of the descriptive business columns Zoho helpers need: business_id -> (fetched_at, row).
+# zoho_lead_id is deliberately not cached; it is written from other processes and must be read fresh.
+_BUSINESS_BUNDLE_TTL_S = 60.0
+_BUSINESS_BUNDLE_COLUMNS = "id, name, image_url"
+_business_bundles: Dict[str, Tuple[float, Dict[str, Any]]] = {}
+_business_bundles_lock = threading.Lock()
+
+def _is_state_zip(segment: str) -> bool:
+    """Check a comma-separated segment for the "XX NNNNN" / "XX NNNNN-NNNN" state+zip shape."""
+    s = segment.lstrip()
+    if len(s) not in (8, 13) or s[2] != ' ':
+        return False
+    if not ('A' <= s[0] <= 'Z' and 'A' <= s[1] <= 'Z'):
+        return False
+    if not s[3:8].isdecimal():
+        return False
+    return len(s) == 8 or (s[8] == '-' and s[9:].isdecimal())
+
+def _match_address(address: str) -> Optional[Dict[str, str]]:
+    """
+    Scan a whitespace-normalized address for "street, city, state zip, country".
+    Picks the first segment after the city that looks like "state zip", as a lazy regex would.
+    """
+    parts = address.split(',')
+    # Street takes the first segment (or the first two if the address starts with a comma)
+    street_end = 1 if parts[0] else 2
+    for i in range(street_end + 1, len(parts) - 1):
+        city = ','.join(parts[street_end:i])
+        country = ','.join(parts[i + 1:])
+        if city and country and _is_state_zip(parts[i]):
+            state_zip = parts[i].lstrip()
+            return {
+                'street': ','.join(parts[:street_end]).strip(),
+                'city': city.strip(),
+                'state': state_zip[:2],
+                'zip_code': state_zip[3:],
+                'country': country.strip(),
+            }
+    return None
+
 def parse_address(formatted_address: str) -> Dict[str, str]:
-    """Parse formatted address into components."""
+    """Parse formatted address into components. Results are memoized per address string."""
     if not formatted_address:
         return {}
+    return dict(_parse_address_cached(formatted_address))
+
+@functools.lru_cache(maxsize=4096)
+def _parse_address_cached(formatted_address: str) -> Tuple[Tuple[str, str], ...]:
+    # Cached as an immutable tuple of items so callers always receive their own dict
+    return tuple(_parse_address(formatted_address).items())
+
+def _parse_address(formatted_address: str) -> Dict[str, str]:
+    # Both the scan and the fallback need street, city, state/zip and country segments
+    if formatted_address.count(',') < 3:
+        return {}
 
     # Remove extra whitespace and normalize
-    address = re.sub(r'\s+', ' ', formatted_address.strip())
+    address = ' '.join(formatted_address.split())
 
-    # Try to match common patterns
-    # Pattern: "street, city, state zip, country"
-    match = re.match(r'^(.+?),\s*(.+?),\s*([A-Z]{2})\s+(\d{5}(?:-\d{4})?),\s*(.+)$', address)
+    # Well-formed US addresses are handled by a direct scan over the comma-separated segments
+    match = _match_address(address)
     if match:
-        return {
-            'street': match.group(1).strip(),
-            'city': match.group(2).strip(),
-            'state': match.group(3).strip(),
-            'zip_code': match.group(4).strip(),
-            'country': match.group(5).strip()
-        }
+        return match
 
-    # Fallback: split by commas
+    # Fallback for malformed addresses: split by commas
     parts = [p.strip() for p in address.split(',')]
     if len(parts) >= 4:
+        state, _, zip_code = parts[2].partition(' ')
         return {
             'street': parts[0],
             'city': parts[1],
-            'state': parts[2].split()[0] if parts[2] else '',
-            'zip_code': ' '.join(parts[2].split()[1:]) if len(parts[2].split()) > 1 else '',
-            'country': parts[3] if len(parts) > 3 else ''
+            'state': state,
+            'zip_code': zip_code,
+            'country': parts[3]
         }
 
     return {}
 
+@functools.lru_cache(maxsize=4096)
 def clean_website_url(url: str) -> str:
     """Remove sub-paths from URL to get root domain."""
     if not url:
         return ''
 
     # Remove protocol
-    url = re.sub(r'^https?://', '', url)
+    if url.startswith('https://'):
+        url = url[8:]
+    elif url.startswith('http://'):
+        url = url[7:]
 
     # Remove path and query
-    url = re.sub(r'/.*', '', url)
+    slash = url.find('/')
+    if slash != -1:
+        url = url[:slash]
 
     return f"https://{url}"
 
 def parse_social_links(social_links: str) -> Dict[str, str]:
-    """Parse social links string into a dictionary."""
-    links = {}
+    """Parse social links string into a dictionary. Results are memoized per input string."""
     if not social_links:
-        return links
+        return {}
+    return dict(_parse_social_links_cached(social_links))
+
+@functools.lru_cache(maxsize=4096)
+def _parse_social_links_cached(social_links: str) -> Tuple[Tuple[str, str], ...]:
+    links = {}
 
     for item in social_links.split(','):
-        item = item.strip()
-        if ':' in item:
-            key, value = item.split(':', 1)
+        key, sep, value = item.partition(':')
+        if sep:
             links[key.strip()] = value.strip()
 
-    return links
+    return tuple(links.items())
 
-def map_business_to_lead(business: Dict[str, Any]) -> Dict[str, Any]:
-    """Map business data to Zoho Lead fields according to spec."""
+def _resolve_website_and_address(business: Dict[str, Any]) -> Tuple[Optional[str], Dict[str, str]]:
+    """Resolve the cleaned website and parsed address shared by the lead and account mappings."""
+    ge = business.get('google_enrichment') or _EMPTY
+    attrs = business.get('attributes') or _EMPTY
 
     # Website priority: attributes.menu_url > google_enrichment.website > website
-    website = (
-        business.get('attributes', {}).get('menu_url') or
-        business.get('google_enrichment', {}).get('website') or
-        business.get('website')
-    )
+    website = attrs.get('menu_url') or ge.get('website') or business.get('website')
     website = clean_website_url(website) if website else None
 
-    # Address parsing
-    address_data = {}
-    if business.get('google_enrichment', {}).get('formatted_address'):
-        address_data = parse_address(business['google_enrichment']['formatted_address'])
-    elif business.get('formatted_address'):
-        address_data = parse_address(business['formatted_address'])
+    # Address priority: google_enrichment.formatted_address > formatted_address > location fields
+    formatted_address = ge.get('formatted_address') or business.get('formatted_address')
+    if formatted_address:
+        address_data = parse_address(formatted_address)
     else:
         # Fallback to location fields
-        location = business.get('location', {})
+        location = business.get('location') or _EMPTY
         address_data = {
             'street': location.get('address1', ''),
             'city': location.get('city', ''),
@@ -98,179 +186,265 @@ def map_business_to_lead(business: Dict[str, Any]) -> Dict[str, Any]:
             'country': location.get('country', '')
         }
 
-    # Parse social links to extract Twitter
-    social_links = parse_social_links(business.get('social_links', ''))
-    twitter = social_links.get('twitter')
-
-    lead_data = {
-        'First_Name': None,  # Empty as per spec
-        'Title': None,  # Empty as per spec
-        'Phone': business.get('phone'),
-        'Lead_Source': 'Web Research',
-        'Industry': None,  # Empty as per spec
-        'Annual_Revenue': None,  # Empty as per spec
-        'Email_Opt_Out': None,  # Empty as per spec
-        'Company': business.get('name'),
-        'Last_Name': business.get('name'),
-        'Email': None,  # Empty as per spec
-        'Fax': None,  # Empty as per spec
-        'Website': website,
-        'Lead_Status': 'Not Contacted',
-        'No_of_Employees': None,  # Empty as per spec
-        'Rating': None,  # Empty as per spec
-        'Secondary_Email': None,  # Empty as per spec
-        'Twitter': twitter,
-        'Street': address_data.get('street'),
-        'City': address_data.get('city'),
-        'State': address_data.get('state'),
-        'Zip_Code': address_data.get('zip_code'),
-        'Country': address_data.get('country'),
-    }
-
-    # Remove None values to avoid sending empty fields
-    return {k: v for k, v in lead_data.items() if v is not None}
+    return website, address_data
+
+def _build_lead(business: Dict[str, Any], website: Optional[str], address_data: Dict[str, str]) -> Dict[str, Any]:
+    # Parse social links to extract Twitter (skip parsing entirely when no twitter entry can exist)
+    social_links = business.get('social_links') or ''
+    twitter = parse_social_links(social_links).get('twitter') if 'twitter' in social_links else None
+
+    # First_Name, Title, Industry, Annual_Revenue, Email_Opt_Out, Email, Fax,
+    # No_of_Employees, Rating and Secondary_Email are left empty as per spec.
+    pairs = (
+        ('Phone', business.get('phone')),
+        ('Lead_Source', 'Web Research'),
+        ('Company', business.get('name')),
+        ('Last_Name', business.get('name')),
+        ('Website', website),
+        ('Lead_Status', 'Not Contacted'),
+        ('Twitter', twitter),
+        ('Street', address_data.get('street')),
+        ('City', address_data.get('city')),
+        ('State', address_data.get('state')),
+        ('Zip_Code', address_data.get('zip_code')),
+        ('Country', address_data.get('country')),
+    )
+
+    # Skip None values to avoid sending empty fields
+    return {k: v for k, v in pairs if v is not None}
+
+def _build_account(business: Dict[str, Any], website: Optional[str], address_data: Dict[str, str]) -> Dict[str, Any]:
+    pairs = (
+        ('Account_Name', business.get('name')),
+        ('Phone', business.get('phone')),
+        ('Website', website),
+        ('Billing_Street', address_data.get('street')),
+        ('Billing_City', address_data.get('city')),
+        ('Billing_State', address_data.get('state')),
+        ('Billing_Code', address_data.get('zip_code')),
+        ('Billing_Country', address_data.get('country')),
+    )
+
+    # Skip None values to avoid sending empty fields
+    return {k: v for k, v in pairs if v is not None}
+
+def map_business_to_lead(business: Dict[str, Any]) -> Dict[str, Any]:
+    """Map business data to Zoho Lead fields according to spec."""
+    return _build_lead(business, *_resolve_website_and_address(business))
 
 def map_business_to_account(business: Dict[str, Any]) -> Dict[str, Any]:
     """Map business data to Zoho Account fields."""
+    return _build_account(business, *_resolve_website_and_address(business))
 
-    # Website priority: attributes.menu_url > google_enrichment.website > website
-    website = (
-        business.get('attributes', {}).get('menu_url') or
-        business.get('google_enrichment', {}).get('website') or
-        business.get('website')
+def map_business_to_lead_and_account(business: Dict[str, Any]) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+    """Map business data to both Zoho Lead and Account fields, resolving website and address only once."""
+    website, address_data = _resolve_website_and_address(business)
+    return _build_lead(business, website, address_data), _build_account(business, website, address_data)
+
+def map_lead_to_account(lead: Dict[str, Any]) -> Dict[str, Any]:
+    """Map lead data to Zoho Account fields."""
+
+    pairs = (
+        ('Account_Name', lead.get('Company')),
+        ('Phone', lead.get('Phone')),
+        ('Website', lead.get('Website')),
+        ('Billing_Street', lead.get('Street')),
+        ('Billing_City', lead.get('City')),
+        ('Billing_State', lead.get('State')),
+        ('Billing_Code', lead.get('Zip_Code')),
+        ('Billing_Country', lead.get('Country')),
     )
-    website = clean_website_url(website) if website else None
 
-    # Address parsing
-    address_data = {}
-    if business.get('google_enrichment', {}).get('formatted_address'):
-        address_data = parse_address(business['google_enrichment']['formatted_address'])
-    elif business.get('formatted_address'):
-        address_data = parse_address(business['formatted_address'])
-    else:
-        # Fallback to location fields
-        location = business.get('location', {})
-        address_data = {
-            'street': location.get('address1', ''),
-            'city': location.get('city', ''),
-            'state': location.get('state', ''),
-            'zip_code': location.get('zip_code', ''),
-            'country': location.get('country', '')
-        }
+    # Skip None values to avoid sending empty fields
+    return {k: v for k, v in pairs if v is not None}
 
-    account_data = {
-        'Account_Name': business.get('name'),
-        'Phone': business.get('phone'),
-        'Website': website,
-        'Billing_Street': address_data.get('street'),
-        'Billing_City': address_data.get('city'),
-        'Billing_State': address_data.get('state'),
-        'Billing_Code': address_data.get('zip_code'),
-        'Billing_Country': address_data.get('country'),
-    }
+# Zoho's insert endpoint accepts at most this many records per call
+_ZOHO_INSERT_BATCH_SIZE = 100
 
-    # Remove None values to avoid sending empty fields
-    return {k: v for k, v in account_data.items() if v is not None}
+def _prepare_lead_data(business: Dict[str, Any]) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+    """Build the new-lead payload (including the campaign) and the account payload for a business."""
+    lead_data, account_data = map_business_to_lead_and_account(business)
+    campaign_id = os.getenv('ZOHO_CAMPAIGN_ID')
+    if campaign_id:
+        lead_data['Campaign'] = {'id': campaign_id}
+    return lead_data, account_data
 
-def map_lead_to_account(lead: Dict[str, Any]) -> Dict[str, Any]:
-    """Map lead data to Zoho Account fields."""
+def _find_existing_lead_id(client, company_name: Optional[str]) -> Optional[str]:
+    """Return the ID of an existing lead with this company name, if any. Existing leads are never modified."""
+    if not company_name:
+        return None
+    existing_leads = client.search_leads({"Company": company_name})
+    logger.info(f"Searched for existing leads with Company: '{company_name}', found: {len(existing_leads)}")
+    return existing_leads[0]['id'] if existing_leads else None
+
+def _find_or_create_account(client, account_data: Dict[str, Any], context: str) -> Optional[str]:
+    """Return the ID of the account named account_data['Account_Name'], creating it only when none exists."""
+    company_name = account_data.get('Account_Name')
+    existing_accounts = client.search_accounts({"Account_Name": company_name})
+    logger.info(f"Searched for existing accounts with Account_Name: '{company_name}', found: {len(existing_accounts)}")
+    if existing_accounts:
+        account_id = existing_accounts[0]['id']
+        logger.info(f"Using existing Zoho account {account_id} for {context}")
+        return account_id
+    logger.info(f"Creating new account for {context} with data: {account_data}")
+    try:
+        account_id = client.create_account(account_data)
+        logger.info(f"Created Zoho account {account_id} for {context}")
+        return account_id
+    except Exception as e:
+        logger.error(f"Failed to create Zoho account for {context}: {e}")
+        return None
 
-    account_data = {
-        'Account_Name': lead.get('Company'),
-        'Phone': lead.get('Phone'),
-        'Website': lead.get('Website'),
-        'Billing_Street': lead.get('Street'),
-        'Billing_City': lead.get('City'),
-        'Billing_State': lead.get('State'),
-        'Billing_Code': lead.get('Zip_Code'),
-        'Billing_Country': lead.get('Country'),
-    }
+def _complete_new_lead(client, business: Dict[str, Any], lead_id: str, account_data: Dict[str, Any]) -> None:
+    """Link an account and add the emails note to a freshly created lead."""
+    business_id = business.get('id')
+    company_name = business.get('name')
+    emails = business.get('emails') or []
 
-    # Remove None values to avoid sending empty fields
-    return {k: v for k, v in account_data.items() if v is not None}
+    # Create or link account
+    account_id = None
+    if company_name:
+        try:
+            account_id = _find_or_create_account(client, account_data, f"business {business_id}")
+        except Exception as e:
+            logger.error(f"Failed to look up Zoho account for business {business_id}: {e}")
+    else:
+        logger.info(f"Skipping account creation for business {business_id} due to missing company name")
+
+    # Link account to lead if account was found or created
+    if account_id:
+        try:
+            success = client.update_lead(lead_id, {'Account': account_id})
+            logger.info(f"Linked account {account_id} to lead {lead_id}, update success: {success}")
+        except Exception as e:
+            logger.error(f"Failed to link account {account_id} to lead {lead_id}: {e}")
+
+    # Create note with emails if available
+    if emails:
+        note_content = _EMAILS_NOTE_PREFIX + ", ".join(emails)
+        note_data = {
+            'Note_Content': note_content
+        }
+        try:
+            client.create_note("Leads", lead_id, note_data)
+            logger.info(f"Added emails note to lead {lead_id}")
+        except Exception as e:
+            logger.error(f"Failed to add emails note to lead {lead_id}: {e}")
 
 def create_zoho_lead_for_business(business: Dict[str, Any]) -> Optional[str]:
-    """Create a Zoho lead for a business and return the lead ID. Checks for duplicates first."""
+    """
+    Create a Zoho lead for a business and return the lead ID. Checks for duplicates first.
+    An existing lead (same Company) is only linked to the business; none of its fields are changed.
+    """
     try:
         client = get_zoho_client()
+        business_id = business['id']
         company_name = business.get('name')
-        logger.info(f"Creating Zoho lead for business {business['id']}, company_name: '{company_name}'")
+        logger.info(f"Creating Zoho lead for business {business_id}, company_name: '{company_name}'")
 
-        # Check for existing lead with same company name
-        if company_name:
-            existing_leads = client.search_leads({"Company": company_name})
-            logger.info(f"Searched for existing leads with Company: '{company_name}', found: {len(existing_leads)}")
-            if existing_leads:
-                existing_lead_id = existing_leads[0]['id']
-                logger.info(f"Found existing Zoho lead {existing_lead_id} for business {business['id']} (company: {company_name})")
-
-                # Update the business record with the existing Zoho lead ID
-                supabase_client = get_client()
-                supabase_client.table("businesses").update({"zoho_lead_id": existing_lead_id}).eq("id", business["id"]).execute()
-
-                return existing_lead_id
-
-        # No existing lead found, create new one
-        lead_data = map_business_to_lead(business)
-        campaign_id = os.getenv('ZOHO_CAMPAIGN_ID')
-        if campaign_id:
-            lead_data['Campaign'] = {'id': campaign_id}
-        lead_id = client.create_lead(lead_data)
-
-        # Create or link account
-        account_id = None
-        company_name = business.get('name')
-        if company_name:
-            # Check for existing account with same company name
-            existing_accounts = client.search_accounts({"Account_Name": company_name})
-            logger.info(f"Searched for existing accounts with Account_Name: '{company_name}', found: {len(existing_accounts)}")
-            if existing_accounts:
-                account_id = existing_accounts[0]['id']
-                logger.info(f"Found existing Zoho account {account_id} for business {business['id']} (company: {company_name})")
-            else:
-                # Create new account
-                account_data = map_business_to_account(business)
-                logger.info(f"Creating new account for business {business['id']} with data: {account_data}")
-                try:
-                    account_id = client.create_account(account_data)
-                    logger.info(f"Created Zoho account {account_id} for business {business['id']}")
-                except Exception as e:
-                    logger.error(f"Failed to create Zoho account for business {business.get('id')}: {e}")
+        lead_id = _find_existing_lead_id(client, company_name)
+        if lead_id:
+            logger.info(f"Found existing Zoho lead {lead_id} for business {business_id} (company: {company_name})")
         else:
-            logger.info(f"Skipping account creation for business {business['id']} due to missing company name")
-
-        # Link account to lead if account was found or created
-        if account_id:
-            try:
-                update_data = {'Account': account_id}
-                success = client.update_lead(lead_id, update_data)
-                logger.info(f"Linked account {account_id} to lead {lead_id}, update success: {success}")
-            except Exception as e:
-                logger.error(f"Failed to link account {account_id} to lead {lead_id}: {e}")
-
-        # Create note with emails if available
-        emails = business.get('emails', [])
-        if emails:
-            note_content = "Emails: " + ", ".join(emails)
-            note_data = {
-                'Note_Content': note_content
-            }
-            try:
-                client.create_note("Leads", lead_id, note_data)
-                logger.info(f"Added emails note to lead {lead_id}")
-            except Exception as e:
-                logger.error(f"Failed to add emails note to lead {lead_id}: {e}")
+            lead_data, account_data = _prepare_lead_data(business)
+            lead_id = client.create_lead(lead_data)
+            _complete_new_lead(client, business, lead_id, account_data)
+            logger.info(f"Created Zoho lead {lead_id} for business {business_id}")
 
         # Update the business record with the Zoho lead ID
         supabase_client = get_client()
-        supabase_client.table("businesses").update({"zoho_lead_id": lead_id}).eq("id", business["id"]).execute()
+        supabase_client.table("businesses").update({"zoho_lead_id": lead_id}).eq("id", business_id).execute()
 
-        logger.info(f"Created Zoho lead {lead_id} for business {business['id']}")
         return lead_id
     except Exception as e:
         logger.error(f"Failed to create Zoho lead for business {business.get('id')}: {e}")
         return None
 
+def create_zoho_leads_bulk(businesses: List[Dict[str, Any]], max_workers: int = 8) -> Dict[str, Optional[str]]:
+    """
+    Create Zoho leads for many businesses with batched round-trips.
+
+    Existing leads are looked up by Company on a bounded thread pool and only linked, never
+    modified. Missing leads are inserted up to 100 per call (one per company name within the
+    batch), their account/note follow-ups run on the same pool, and the resulting lead IDs are
+    written back to Supabase in a single upsert.
+    Returns a mapping of business id -> lead id (None on failure).
+    """
+    businesses = [b for b in businesses or [] if b.get('id')]
+    if not businesses:
+        return {}
+
+    lead_ids: Dict[str, Optional[str]] = {b['id']: None for b in businesses}
+    try:
+        client = get_zoho_client()
+    except Exception as e:
+        logger.error(f"Failed to create Zoho leads for {len(businesses)} businesses: {e}")
+        return lead_ids
+
+    # Only the first business per company name is looked up/created; later ones reuse its lead
+    firsts: List[Dict[str, Any]] = []
+    first_by_company: Dict[str, str] = {}
+    followers: List[Tuple[str, str]] = []
+    for business in businesses:
+        company_name = business.get('name')
+        if company_name and company_name in first_by_company:
+            followers.append((business['id'], first_by_company[company_name]))
+            continue
+        if company_name:
+            first_by_company[company_name] = business['id']
+        firsts.append(business)
+
+    workers = max(1, min(max_workers, len(firsts)))
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="zoho") as executor:
+        # Searches are independent per company; the client's rate limiter keeps them under quota
+        def _lookup(business: Dict[str, Any]) -> Tuple[Dict[str, Any], Optional[str], bool]:
+            try:
+                return business, _find_existing_lead_id(client, business.get('name')), True
+            except Exception as e:
+                logger.error(f"Failed to search Zoho leads for business {business['id']}: {e}")
+                return business, None, False
+
+        to_create: List[Tuple[Dict[str, Any], Dict[str, Any], Dict[str, Any]]] = []
+        for business, existing_id, ok in executor.map(_lookup, firsts):
+            if existing_id:
+                lead_ids[business['id']] = existing_id
+                logger.info(f"Found existing Zoho lead {existing_id} for business {business['id']} (company: {business.get('name')})")
+            elif ok:
+                lead_data, account_data = _prepare_lead_data(business)
+                to_create.append((business, lead_data, account_data))
+
+        new_leads: List[Tuple[Dict[str, Any], str, Dict[str, Any]]] = []
+        for start in range(0, len(to_create), _ZOHO_INSERT_BATCH_SIZE):
+            chunk = to_create[start:start + _ZOHO_INSERT_BATCH_SIZE]
+            try:
+                results = client.create_records("Leads", [lead_data for _, lead_data, _ in chunk])
+            except Exception as e:
+                logger.error(f"Failed to create Zoho leads batch of {len(chunk)}: {e}")
+                continue
+            for (business, _, account_data), result in zip(chunk, results):
+                lead_id = (result.get('details') or {}).get('id')
+                if not lead_id:
+                    logger.error(f"Failed to create Zoho lead for business {business['id']}: {result.get('message') or result}")
+                    continue
+                lead_ids[business['id']] = lead_id
+                new_leads.append((business, lead_id, account_data))
+
+        if new_leads:
+            list(executor.map(lambda item: _complete_new_lead(client, *item), new_leads))
+            logger.info(f"Created {len(new_leads)} new Zoho leads")
+
+    for business_id, first_id in followers:
+        lead_ids[business_id] = lead_ids[first_id]
+
+    rows = [{"id": business_id, "zoho_lead_id": lead_id} for business_id, lead_id in lead_ids.items() if lead_id]
+    if rows:
+        try:
+            get_client().table("businesses").upsert(rows, on_conflict="id").execute()
+        except Exception as e:
+            logger.error(f"Failed to store Zoho lead IDs for {len(rows)} businesses: {e}")
+
+    return lead_ids
+
 def update_lead(lead_id: str, lead_data: Dict[str, Any]) -> bool:
     """Update an existing lead in Zoho CRM."""
     try:
@@ -311,24 +485,69 @@ def derive_name_from_email(email: str) -> Tuple[Optional[str], Optional[str]]:
 
     local_part = email.split('@')[0].lower()
 
-    # Only handle clear, unambiguous patterns
-    patterns = [
-        (r'^([a-z]+)\_([a-z]+)$', lambda m: (m.group(1).capitalize(), m.group(2).capitalize())),  # john_doe
-        (r'^([a-z]+)\.([a-z]+)$', lambda m: (m.group(1).capitalize(), m.group(2).capitalize())),  # john.doe
-        (r'^([a-z])\.([a-z]+)$', lambda m: (m.group(1).upper(), m.group(2).capitalize())),  # j.doe
-    ]
-
-    for pattern, extractor in patterns:
-        match = re.match(pattern, local_part)
-        if match:
-            first, last = extractor(match)
-            return first, last
+    # Only handle clear, unambiguous patterns: john_doe, john.doe, j.doe
+    separator = '_' if '_' in local_part else '.' if '.' in local_part else None
+    if separator:
+        first, _, last = local_part.partition(separator)
+        if first.isascii() and first.isalpha() and last.isascii() and last.isalpha():
+            return first.capitalize(), last.capitalize()
 
     # For ambiguous cases, use as last name only to avoid incorrect assumptions
     return None, local_part.capitalize()
 
+def _process_contact_email(client, lead_id: str, account_id: Optional[str], email: str) -> None:
+    """Create or link the Zoho contact for a single email. Independent per email, so safe to run concurrently."""
+    logger.info(f"Processing contact for email {email}, will link to account {account_id}")
+    # Check if contact already exists with this email
+    existing_contact = client.find_one_contact({"Email": email}, fields=['id', 'Lead', 'Account_Name'])
+    logger.info(f"Searched for existing contact with Email: '{email}', found: {bool(existing_contact)}")
+    if existing_contact:
+        # Check if contact is already linked to this lead
+        contact_id = existing_contact['id']
+        # The search already returns Lead; only fetch the full record if it was left out
+        contact_details = existing_contact if 'Lead' in existing_contact else client.get_contact(contact_id)
+        lead_field = contact_details.get('Lead') if contact_details else None
+        if contact_details and lead_field == lead_id:
+            logger.info(f"Contact {contact_id} for email {email} is already linked to lead {lead_id}, skipping update")
+        else:
+            # Update existing contact to link with the lead and account
+            update_data = {'Lead': lead_id}
+            if account_id:
+                update_data['Account_Name'] = account_id
+            logger.info(f"Updating existing contact {contact_id} with data: {update_data}")
+            success = client.update_contact(contact_id, update_data)
+            if success:
+                logger.info(f"Linked existing contact {contact_id} for email {email} to lead {lead_id}")
+            else:
+                logger.error(f"Failed to link existing contact {contact_id} for email {email} to lead {lead_id}")
+    else:
+        # Create new contact
+        first_name, last_name = derive_name_from_email(email)
+
+        contact_data = {
+            'Email': email,
+            'First_Name': first_name,
+            'Last_Name': last_name,
+            'Lead_Source': 'Web Research',
+            'Lead': lead_id  # Link to lead during creation
+        }
+        if account_id:
+            contact_data['Account_Name'] = account_id  # Link to account during creation
+
+        # Remove None values
+        contact_data = {k: v for k, v in contact_data.items() if v is not None}
+        logger.info(f"Creating new contact for email {email} with data: {contact_data}")
+
+        try:
+            contact_id = client.create_contact(contact_data)
+            logger.info(f"Created contact {contact_id} for email {email} linked to lead {lead_id}")
+        except Exception as e:
+            logger.error(f"Failed to create contact for email {email}: {e}")
+
 def create_contacts_for_emails(lead_id: str, emails: List[str]) -> bool:
     """Create Zoho contacts for each unique email associated with the lead, or link existing contacts."""
+    # Normalize and de-duplicate up front so case variants don't trigger repeat searches
+    emails = list(dict.fromkeys(e.strip().lower() for e in emails or [] if e and '@' in e))
     if not emails:
         return True
 
@@ -347,18 +566,11 @@ def create_contacts_for_emails(lead_id: str, emails: List[str]) -> bool:
             else:
                 account_data = map_lead_to_account(lead_details)
                 logger.info(f"Lead has no account, creating account from lead data: {account_data}")
-                existing_accounts = client.search_accounts({"Account_Name": company_name})
-                logger.info(f"Searched for existing accounts with Account_Name: '{company_name}', found: {len(existing_accounts)}")
-                if existing_accounts:
-                    account_id = existing_accounts[0]['id']
-                    logger.info(f"Using existing account {account_id} for lead {lead_id}")
-                else:
-                    try:
-                        account_id = client.create_account(account_data)
-                        logger.info(f"Created Zoho account {account_id} for lead {lead_id}")
-                    except Exception as e:
-                        logger.error(f"Failed to create account for lead {lead_id}: {e}")
-                        # Continue without account
+                try:
+                    account_id = _find_or_create_account(client, account_data, f"lead {lead_id}")
+                except Exception as e:
+                    logger.error(f"Failed to look up account for lead {lead_id}: {e}")
+                    # Continue without account
                 if account_id:
                     # Link account to lead
                     update_data = {'Account': account_id}
@@ -368,82 +580,55 @@ def create_contacts_for_emails(lead_id: str, emails: List[str]) -> bool:
                     else:
                         logger.error(f"Failed to link account {account_id} to lead {lead_id}")
 
-        processed_emails = set()
-
-        for email in emails:
-            if email in processed_emails:
-                continue
-
-            logger.info(f"Processing contact for email {email}, will link to account {account_id}")
-            # Check if contact already exists with this email
-            existing_contacts = client.search_contacts({"Email": email})
-            logger.info(f"Searched for existing contacts with Email: '{email}', found: {len(existing_contacts)}")
-            if existing_contacts:
-                # Check if contact is already linked to this lead
-                contact_id = existing_contacts[0]['id']
-                contact_details = client.get_contact(contact_id)
-                lead_field = contact_details.get('Lead') if contact_details else None
-                if contact_details and lead_field == lead_id:
-                    logger.info(f"Contact {contact_id} for email {email} is already linked to lead {lead_id}, skipping update")
-                    processed_emails.add(email)
-                else:
-                    # Update existing contact to link with the lead and account
-                    update_data = {'Lead': lead_id}
-                    if account_id:
-                        update_data['Account_Name'] = account_id
-                    logger.info(f"Updating existing contact {contact_id} with data: {update_data}")
-                    success = client.update_contact(contact_id, update_data)
-                    if success:
-                        logger.info(f"Linked existing contact {contact_id} for email {email} to lead {lead_id}")
-                        processed_emails.add(email)
-                    else:
-                        logger.error(f"Failed to link existing contact {contact_id} for email {email} to lead {lead_id}")
-            else:
-                # Create new contact
-                first_name, last_name = derive_name_from_email(email)
-
-                contact_data = {
-                    'Email': email,
-                    'First_Name': first_name,
-                    'Last_Name': last_name,
-                    'Lead_Source': 'Web Research',
-                    'Lead': lead_id  # Link to lead during creation
-                }
-                if account_id:
-                    contact_data['Account_Name'] = account_id  # Link to account during creation
-
-                # Remove None values
-                contact_data = {k: v for k, v in contact_data.items() if v is not None}
-                logger.info(f"Creating new contact for email {email} with data: {contact_data}")
-
-                try:
-                    contact_id = client.create_contact(contact_data)
-                    logger.info(f"Created contact {contact_id} for email {email} linked to lead {lead_id}")
-                    processed_emails.add(email)
-                except Exception as e:
-                    logger.error(f"Failed to create contact for email {email}: {e}")
-                    continue
+        # Each email's search/update/create sequence is independent; overlap their round-trips
+        with ThreadPoolExecutor(max_workers=min(8, len(emails)), thread_name_prefix="zoho-contacts") as executor:
+            list(executor.map(lambda email: _process_contact_email(client, lead_id, account_id, email), emails))
 
         return True
     except Exception as e:
         logger.error(f"Failed to process contacts for lead {lead_id}: {e}")
         return False
 
-def attach_pdf_to_lead(lead_id: str, pdf_path: str, report_type: str) -> bool:
-    """Attach a PDF report to a Zoho lead."""
+def attach_pdf_to_lead(lead_id: str, pdf_path: str, report_type: str, business_name: Optional[str] = None) -> bool:
+    """Attach a PDF report to a Zoho lead. Pass business_name when known to skip the Supabase lookup."""
     try:
         client = get_zoho_client()
-        business_name = get_business_name_by_lead_id(lead_id) or "Business"
+        business_name = business_name or get_business_name_by_lead_id(lead_id) or "Business"
         file_name = f"{report_type} - {business_name}.pdf"
 
         success = client.attach_document("Leads", lead_id, pdf_path, file_name)
         if success:
+            _record_attachment(lead_id, file_name)
             logger.info(f"Attached {report_type} PDF to lead {lead_id}")
         return success
     except Exception as e:
         logger.error(f"Failed to attach PDF to lead {lead_id}: {e}")
         return False
 
+def get_business_bundle(business_id: str) -> Optional[Dict[str, Any]]:
+    """
+    Get the id, name and image_url of a business in one select.
+    Rows are cached briefly so the image and report steps for a business share a single round-trip;
+    callers get their own copy.
+    """
+    now = time.monotonic()
+    with _business_bundles_lock:
+        cached = _business_bundles.get(business_id)
+    if cached and now - cached[0] < _BUSINESS_BUNDLE_TTL_S:
+        return dict(cached[1])
+
+    try:
+        supabase_client = get_client()
+        response = supabase_client.table("businesses").select(_BUSINESS_BUNDLE_COLUMNS).eq("id", business_id).single().execute()
+    except Exception:
+        return None
+    if not response.data:
+        return None
+
+    with _business_bundles_lock:
+        _business_bundles[business_id] = (now, dict(response.data))
+    return response.data
+
 def get_business_name_by_lead_id(lead_id: str) -> Optional[str]:
     """Get business name by Zoho lead ID."""
     try:
@@ -454,7 +639,7 @@ def get_business_name_by_lead_id(lead_id: str) -> Optional[str]:
         return None
 
 def get_lead_id_by_business_id(business_id: str) -> Optional[str]:
-    """Get Zoho lead ID for a business."""
+    """Get Zoho lead ID for a business. Always read fresh so a lead created elsewhere is never missed."""
     try:
         supabase_client = get_client()
         response = supabase_client.table("businesses").select("zoho_lead_id").eq("id", business_id).single().execute()
@@ -469,15 +654,14 @@ def add_or_update_emails_note(lead_id: str, emails: List[str]) -> bool:
 
     try:
         client = get_zoho_client()
-        note_content = "Emails: " + ", ".join(emails)
+        note_content = _EMAILS_NOTE_PREFIX + ", ".join(emails)
 
         # Get existing notes for the lead
         notes = client.get_notes("Leads", lead_id)
-        emails_note = None
-        for note in notes:
-            if note.get('Note_Content', '').startswith('Emails: '):
-                emails_note = note
-                break
+        emails_note = next(
+            (note for note in notes if (note.get('Note_Content') or '').startswith(_EMAILS_NOTE_PREFIX)),
+            None,
+        )
 
         if emails_note:
             # Update existing note
@@ -496,16 +680,32 @@ def add_or_update_emails_note(lead_id: str, emails: List[str]) -> bool:
         logger.error(f"Failed to add/update emails note for lead {lead_id}: {e}")
         return False
 
+def _get_attachment_index(client, lead_id: str) -> FrozenSet[str]:
+    """Return the lead's attachment file names, fetched at most once per TTL window."""
+    now = time.monotonic()
+    with _attachment_index_lock:
+        cached = _attachment_index.get(lead_id)
+    if cached and now - cached[0] < _ATTACHMENT_INDEX_TTL_S:
+        return cached[1]
+
+    attachments = client.get_attachments("Leads", lead_id)
+    names = frozenset(att.get("File_Name") or "" for att in attachments)
+    with _attachment_index_lock:
+        _attachment_index[lead_id] = (now, names)
+    return names
+
+def _record_attachment(lead_id: str, file_name: str) -> None:
+    """Add a newly uploaded file to the cached index so follow-up checks see it without refetching."""
+    with _attachment_index_lock:
+        cached = _attachment_index.get(lead_id)
+        if cached:
+            _attachment_index[lead_id] = (cached[0], cached[1] | {file_name})
+
 def check_report_attachment_exists(lead_id: str, report_type: str, business_name: str) -> bool:
     """Check if a report attachment already exists for the lead."""
     try:
         client = get_zoho_client()
-        attachments = client.get_attachments("Leads", lead_id)
-        expected_name = f"{report_type} - {business_name}.pdf"
-        for att in attachments:
-            if att.get("File_Name") == expected_name:
-                return True
-        return False
+        return f"{report_type} - {business_name}.pdf" in _get_attachment_index(client, lead_id)
     except Exception as e:
         logger.warning(f"Failed to check attachments for lead {lead_id}: {e}")
         return False  # On error, assume not exists to allow upload
@@ -514,12 +714,8 @@ def check_image_attachment_exists(lead_id: str, business_name: str) -> bool:
     """Check if a business image attachment already exists for the lead."""
     try:
         client = get_zoho_client()
-        attachments = client.get_attachments("Leads", lead_id)
-        for att in attachments:
-            file_name = att.get("File_Name", "")
-            if file_name.startswith(f"Business Image - {business_name}"):
-                return True
-        return False
+        prefix = f"Business Image - {business_name}"
+        return any(name.startswith(prefix) for name in _get_attachment_index(client, lead_id))
     except Exception as e:
         logger.warning(f"Failed to check image attachments for lead {lead_id}: {e}")
         return False  # On error, assume not exists to allow upload
@@ -529,36 +725,39 @@ def attach_image_to_lead(business_id: str, lead_id: str) -> bool:
     logger.info(f"attach_image_to_lead called for business_id={business_id}, lead_id={lead_id}")
     try:
         # Get image_url and business name
-        supabase_client = get_client()
-        response = supabase_client.table("businesses").select("image_url, name").eq("id", business_id).single().execute()
-        if not response.data or not response.data.get("image_url"):
+        bundle = get_business_bundle(business_id)
+        if not bundle or not bundle.get("image_url"):
             logger.info(f"No image_url for business {business_id}")
             return False
 
-        image_url = response.data["image_url"]
-        business_name = response.data.get("name", "Business")
+        image_url = bundle["image_url"]
+        business_name = bundle.get("name", "Business")
         logger.info(f"Retrieved image_url='{image_url}' and business_name='{business_name}' for business {business_id}")
 
         # Note: For photo upload, we don't check existence as photo can be updated
 
-        # Download the image
+        # Download the image, streaming the body straight into a temporary file
         logger.info(f"Attempting to download image from {image_url}")
-        response_img = requests.get(image_url, timeout=30)
-        response_img.raise_for_status()
-        logger.info(f"Successfully downloaded image, status={response_img.status_code}, content-length={response_img.headers.get('content-length', 'unknown')}")
-
-        content_type = response_img.headers.get('content-type', 'image/jpeg')
-        ext = mimetypes.guess_extension(content_type) or '.jpg'
-        file_name = f"Business Image - {business_name}{ext}"
-        logger.info(f"Detected content_type='{content_type}', extension='{ext}', file_name='{file_name}'")
-
-        # Save to temporary file
-        with tempfile.NamedTemporaryFile(delete=False, suffix=ext) as temp_file:
-            temp_file.write(response_img.content)
-            temp_file_path = temp_file.name
-        logger.info(f"Saved image to temp file: {temp_file_path}, size={len(response_img.content)} bytes")
-
+        temp_file_path = None
         try:
+            with _HTTP.get(image_url, timeout=30, stream=True) as response_img:
+                response_img.raise_for_status()
+                logger.info(f"Connected to image, status={response_img.status_code}, content-length={response_img.headers.get('content-length', 'unknown')}")
+
+                content_type = response_img.headers.get('content-type', 'image/jpeg')
+                mime_type = content_type.split(';', 1)[0].strip().lower()
+                ext = _IMAGE_EXTENSIONS.get(mime_type) or mimetypes.guess_extension(mime_type) or '.jpg'
+                file_name = f"Business Image - {business_name}{ext}"
+                logger.info(f"Detected content_type='{content_type}', extension='{ext}', file_name='{file_name}'")
+
+                # Save to temporary file; the raw fd from mkstemp skips NamedTemporaryFile's wrapper
+                fd, temp_file_path = tempfile.mkstemp(suffix=ext)
+                with os.fdopen(fd, 'wb', buffering=1 << 20) as temp_file:
+                    response_img.raw.decode_content = True  # transparently handle gzip/deflate
+                    shutil.copyfileobj(response_img.raw, temp_file, 64 * 1024)
+                    size = temp_file.tell()
+            logger.info(f"Saved image to temp file: {temp_file_path}, size={size} bytes")
+
             # Attach to Zoho lead
             logger.info(f"Attempting to attach document to Zoho lead {lead_id}: file_name='{file_name}', content_type='{content_type}'")
             client = get_zoho_client()
@@ -569,9 +768,10 @@ def attach_image_to_lead(business_id: str, lead_id: str) -> bool:
                 logger.error(f"Zoho upload_photo returned False for lead {lead_id}")
             return success
         finally:
-            # Clean up temp file
-            os.unlink(temp_file_path)
-            logger.info(f"Cleaned up temp file: {temp_file_path}")
+            # Clean up temp file, including when the download or client setup failed part-way
+            if temp_file_path:
+                os.unlink(temp_file_path)
+                logger.info(f"Cleaned up temp file: {temp_file_path}")
 
     except Exception as e:
         logger.error(f"Failed to attach image to lead {lead_id} for business {business_id}: {e}")
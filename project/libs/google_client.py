@@ -1,134 +1,391 @@
+import copy
+import functools
 import os
 import time
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from typing import Dict, Any, Optional, List
+from datetime import datetime
 from dotenv import load_dotenv
 import googlemaps
+
+try:
+    from requests_cache import CachedSession  # type: ignore
+except Exception:  # pragma: no cover
+    CachedSession = None
+
+try:
+    import orjson  # type: ignore
+except Exception:  # pragma: no cover
+    orjson = None
 import logging
+import threading
+from collections import OrderedDict
 
 # Load environment variables from .env
 load_dotenv()
 
 GOOGLE_API_KEY = os.getenv("GOOGLE_MAPS_API_KEY") or os.getenv("GOOGLE_API_KEY")
+# SQLite file backing the HTTP cache for Places v1 details (used when requests-cache is installed);
+# unset keeps it in the user cache directory, outside the working tree
+GOOGLE_PLACES_CACHE_PATH = os.getenv("GOOGLE_PLACES_CACHE_PATH")
 logger = logging.getLogger("project.libs.google_client")
 
+# Places API (new) text search
+_SEARCH_TEXT_URL = "https://places.googleapis.com/v1/places:searchText"
+# Single-candidate lookups only need the id plus what the enrichment fallback reads
+_FIND_PLACE_HEADERS = {"X-Goog-FieldMask": "places.id,places.displayName,places.types"}
+
+# Fields requested from the old Places API when the v1 details call fails
+_OLD_FIELDS = (
+    "place_id",
+    "name",
+    "business_status",
+    "formatted_address",
+    "address_component",
+    "adr_address",
+    "vicinity",
+    "plus_code",
+    "utc_offset",
+    "formatted_phone_number",
+    "international_phone_number",
+    "website",
+    "url",
+    "geometry",
+    "opening_hours",
+    "current_opening_hours",
+    "secondary_opening_hours",
+    "rating",
+    "user_ratings_total",
+    "price_level",
+    "reviews",
+    "photo",
+    "icon",
+    "editorial_summary",
+    "reservable",
+    "curbside_pickup",
+    "delivery",
+    "dine_in",
+    "takeout",
+    "wheelchair_accessible_entrance",
+    "serves_breakfast",
+    "serves_lunch",
+    "serves_dinner",
+    "serves_beer",
+    "serves_wine",
+    "serves_brunch",
+    "permanently_closed",
+    "type",
+)
+
+# Places API (new) details: only the fields read downstream (business and rank reports, Zoho leads,
+# type resolution). Each extra field can move the call to a more expensive SKU; reviews already
+# need the top one, so nothing else should be added without a reader.
+_DETAILS_FIELD_MASK = ",".join((
+    "id", "displayName", "businessStatus", "formattedAddress", "plusCode", "websiteUri", "location",
+    "regularOpeningHours", "userRatingCount", "reviews", "types", "primaryTypeDisplayName",
+))
+
+_PLACE_URL = "https://places.googleapis.com/v1/places/{}"
+_DETAILS_HEADERS = {"X-Goog-FieldMask": _DETAILS_FIELD_MASK}
+
+# v1 fields that map one-to-one onto an old-API key
+_V1_TO_LEGACY_KEYS = {
+    "id": "place_id",
+    "businessStatus": "business_status",
+    "formattedAddress": "formatted_address",
+    "websiteUri": "website",
+    "userRatingCount": "user_ratings_total",
+}
+
+# v1 fields kept verbatim next to the legacy keys; they are always present in the merged details
+# (None unless listed in _DETAILS_FIELD_MASK)
+_REQUIRED_NEW_API_FIELDS = (
+    "types", "primaryTypeDisplayName", "displayName", "shortFormattedAddress",
+    "googleMapsUri", "parkingOptions", "paymentOptions", "accessibilityOptions",
+)
+
+
+def _json(response: Any) -> Any:
+    """Decode a JSON response body, using orjson when it is installed."""
+    if orjson is not None:
+        return orjson.loads(response.content)
+    return response.json()
+
+
+def _legacy_opening_hours(hours: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+    """Convert v1 opening hours ({day, hour, minute} points) to the old {open_now, periods, weekday_text} shape."""
+    if not hours:
+        return None
+
+    def _point(point: Dict[str, Any]) -> Dict[str, Any]:
+        return {"day": point.get("day"), "time": f"{point.get('hour', 0):02d}{point.get('minute', 0):02d}"}
+
+    legacy = {
+        "periods": [
+            {k: _point(period[k]) for k in ("open", "close") if period.get(k)}
+            for period in hours.get("periods", [])
+        ],
+        "weekday_text": hours.get("weekdayDescriptions", []),
+    }
+    if "openNow" in hours:
+        legacy["open_now"] = hours["openNow"]
+    return legacy
+
+
+def _legacy_review(review: Dict[str, Any]) -> Dict[str, Any]:
+    """Convert a v1 review to the old-API review keys the report templates read."""
+    author = review.get("authorAttribution") or {}
+    text = review.get("text") or {}
+    publish_time = review.get("publishTime")
+    try:
+        timestamp = int(datetime.fromisoformat(publish_time.replace("Z", "+00:00")).timestamp()) if publish_time else None
+    except ValueError:
+        timestamp = None
+    return {
+        "author_name": author.get("displayName"),
+        "author_url": author.get("uri"),
+        "profile_photo_url": author.get("photoUri"),
+        "rating": review.get("rating"),
+        "relative_time_description": review.get("relativePublishTimeDescription"),
+        "text": text.get("text"),
+        "language": text.get("languageCode"),
+        "time": timestamp,
+    }
+
+
+def _legacy_details_from_v1(place: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Map a Places API (new) details payload onto the old-API snake_case keys consumed downstream,
+    keeping the v1-only fields (types, primaryTypeDisplayName, ...) as-is.
+    """
+    details: Dict[str, Any] = {
+        legacy: place[v1] for v1, legacy in _V1_TO_LEGACY_KEYS.items() if v1 in place
+    }
+    details["name"] = (place.get("displayName") or {}).get("text")
+
+    if place.get("location"):
+        location = place["location"]
+        details["geometry"] = {"location": {"lat": location.get("latitude"), "lng": location.get("longitude")}}
+    if place.get("plusCode"):
+        details["plus_code"] = {
+            "global_code": place["plusCode"].get("globalCode"),
+            "compound_code": place["plusCode"].get("compoundCode"),
+        }
+    if place.get("regularOpeningHours"):
+        details["opening_hours"] = _legacy_opening_hours(place["regularOpeningHours"])
+    if place.get("reviews"):
+        details["reviews"] = [_legacy_review(review) for review in place["reviews"]]
+    if details.get("business_status") == "CLOSED_PERMANENTLY":
+        details["permanently_closed"] = True
+
+    for field in _REQUIRED_NEW_API_FIELDS:
+        details[field] = place.get(field)
+    return details
+
+# Generic Google place types that say nothing about the kind of business
+_GENERIC_TYPES = frozenset((
+    "establishment", "point_of_interest", "food", "drink", "store", "health",
+    "place_of_worship", "locality", "political", "geocode", "premise",
+    "street_address", "intersection", "postal_code", "country",
+    "administrative_area_level_1", "administrative_area_level_2",
+    "administrative_area_level_3", "colloquial_area", "sublocality",
+    "neighborhood", "route", "street_number", "floor", "room",
+))
+
+# Google detail fields copied to the top level of a business when Yelp lacks them
+_PROMOTE_FIELDS = (
+    "formatted_address",
+    "formatted_phone_number",
+    "international_phone_number",
+    "geometry",
+    "opening_hours",
+    "user_ratings_total",
+    "rating",
+    "website",
+    "business_status",
+)
+
+# Place details shared across GoogleClient instances: (api_key, place_id) -> (fetched_at, details)
+_PLACE_DETAILS_CACHE_SIZE = 4096
+_PLACE_DETAILS_TTL_S = 24 * 60 * 60
+_place_details_cache: "OrderedDict[tuple, tuple]" = OrderedDict()
+_place_details_lock = threading.Lock()
+
+def _specific_types(types: List[str]) -> List[str]:
+    """Drop generic Google types, keeping order (the first remaining type becomes the business type)."""
+    if _GENERIC_TYPES.isdisjoint(types):
+        return list(types)
+    return [t for t in types if t not in _GENERIC_TYPES]
+
+
+def _places_retry() -> Retry:
+    """Retry policy for Places v1: jittered exponential backoff that honors Retry-After on 429/5xx."""
+    kwargs = dict(
+        total=3,
+        backoff_factor=0.5,
+        status_forcelist=[429, 500, 502, 503, 504],
+        allowed_methods=None,  # searchText is a read-only POST, so it is safe to retry as well
+        respect_retry_after_header=True,
+    )
+    try:
+        return Retry(backoff_jitter=0.25, **kwargs)
+    except TypeError:
+        # backoff_jitter needs urllib3 2.x; older versions still get the plain exponential backoff
+        return Retry(**kwargs)
+
 class GoogleClient:
     """Google Maps Places API client for fetching business data."""
 
-    def __init__(self, api_key: Optional[str] = None):
+    def __init__(self, api_key: Optional[str] = None, max_workers: int = 10, queries_per_second: int = 50):
         self.api_key = api_key or GOOGLE_API_KEY
         if not self.api_key:
             raise ValueError("GOOGLE_API_KEY is missing. Please add it to your environment variables.")
-        self.client = googlemaps.Client(key=self.api_key)
+        # googlemaps throttles cooperatively, which keeps BusinessIntegrator's parallel workers under quota
+        self.client = googlemaps.Client(
+            key=self.api_key,
+            queries_per_second=queries_per_second,
+            # Bounded timeouts so a stalled request can't pin a pooled connection
+            connect_timeout=3.05,
+            read_timeout=10,
+        )
+        # Pool size BusinessIntegrator uses to enrich businesses concurrently
+        self.max_workers = max_workers
+
+        self._http = self._build_places_http()
+
+    def _build_places_http(self):
+        """
+        Build the pooled keep-alive requests session for the new Places API, with Retry on 429/5xx.
+        Cached on disk when requests-cache is installed.
+        """
+        # With requests-cache available, GET place details are kept for a day and revalidated via
+        # ETag/Cache-Control. searchText POSTs (competitor ranks) are never cached, and the API key
+        # header is left out of the stored requests.
+        if CachedSession is not None:
+            session = CachedSession(
+                GOOGLE_PLACES_CACHE_PATH or "paradane_google_places",
+                backend="sqlite",
+                use_cache_dir=GOOGLE_PLACES_CACHE_PATH is None,
+                expire_after=24 * 60 * 60,
+                cache_control=True,
+                allowable_methods=("GET",),
+                ignored_parameters=["X-Goog-Api-Key"],
+            )
+        else:
+            session = requests.Session()
+        session.headers["X-Goog-Api-Key"] = self.api_key
+        # Retry replaces the manual retry loop
+        session.mount("https://", HTTPAdapter(
+            pool_connections=10,
+            pool_maxsize=64,
+            max_retries=_places_retry(),
+        ))
+        self._timeout = (3.05, 10)
+        return session
+
+    def _find_first_place(self, query: str, lat: Optional[float] = None, lng: Optional[float] = None) -> Optional[Dict[str, Any]]:
+        """
+        Return the top searchText candidate for a query (place_id, name, types), or None.
+        Asks for a single result with a minimal field mask, so only one small candidate crosses the wire.
+        """
+        body: Dict[str, Any] = {"textQuery": query, "pageSize": 1}
+        if lat and lng:
+            body["locationBias"] = {"circle": {"center": {"latitude": lat, "longitude": lng}, "radius": 5000.0}}
+        response = self._http.post(_SEARCH_TEXT_URL, json=body, headers=_FIND_PLACE_HEADERS, timeout=self._timeout)
+        response.raise_for_status()
+        places = _json(response).get("places") or []
+        if not places:
+            return None
+        place = places[0]
+        return {
+            "place_id": place.get("id"),
+            "name": (place.get("displayName") or {}).get("text"),
+            "types": place.get("types", []),
+        }
 
     def search_place(self, query: str, location: str) -> Optional[Dict[str, Any]]:
         """
         Search for a business by text query and location.
         :param query: Business name (string)
         :param location: Location string (city, state)
-        :return: First matching business dict or None
+        :return: First matching business dict (place_id, name, types) or None
         """
-        results = self.client.places(query=f"{query}, {location}")
-        candidates = results.get("results", [])
-        return candidates[0] if candidates else None
+        return self._find_first_place(f"{query}, {location}")
+
+    def _fetch_old_details(self, place_id: str) -> Dict[str, Any]:
+        """
+        Fetch place details from the old Places API (googlemaps). Used as a fallback.
+        googlemaps already retries 5xx and over-quota responses with jittered backoff, so one call suffices.
+        """
+        try:
+            results = self.client.place(place_id=place_id, fields=_OLD_FIELDS)
+            old_details = results.get("result", {})
+            logger.info(f"Old API returned details with keys: {list(old_details.keys())}")
+            return old_details
+        except Exception as e:
+            logger.error(f"Old API request failed for {place_id}: {e}")
+            return {}
+
+    def _fetch_new_details(self, place_id: str) -> Dict[str, Any]:
+        """Fetch the full field-masked place details from the new Places API (v1) through the pooled session."""
+        new_details = {}
+        try:
+            response = self._http.get(_PLACE_URL.format(place_id), headers=_DETAILS_HEADERS, timeout=self._timeout)
+            if response.status_code == 200:
+                new_details = _json(response)
+                logger.info(f"New API returned details with keys: {list(new_details.keys())}")
+            else:
+                logger.warning(f"New API request failed for {place_id}: {response.status_code} {response.text}")
+        except Exception as e:
+            logger.error(f"New API request failed for {place_id}: {e}")
+        return new_details
 
     def get_place_details(self, place_id: str) -> Dict[str, Any]:
         """
-        Fetch detailed information about a business by Place ID using both old and new Places APIs.
+        Fetch detailed information about a business by Place ID from the Places API (new), falling back
+        to the old Places API only when the new call returns nothing.
+        Results are cached per place for a day, so repeated lookups of the same place are fetched once.
         :param place_id: Google Maps Place ID
-        :return: Merged place details as a dictionary
+        :return: Place details as a dictionary, using the old-API key names
+        """
+        key = (self.api_key, place_id)
+        now = time.monotonic()
+        with _place_details_lock:
+            cached = _place_details_cache.get(key)
+            if cached and now - cached[0] < _PLACE_DETAILS_TTL_S:
+                _place_details_cache.move_to_end(key)
+                logger.info(f"Using cached details for place_id: {place_id}")
+                # Deep copy: nested opening_hours/reviews/photos/geometry must not be shared with the cache
+                return copy.deepcopy(cached[1])
+
+        details = self._fetch_place_details(place_id)
+
+        # Only cache real answers; a double failure should be retried next time
+        if any(value is not None for value in details.values()):
+            with _place_details_lock:
+                _place_details_cache[key] = (now, copy.deepcopy(details))
+                _place_details_cache.move_to_end(key)
+                while len(_place_details_cache) > _PLACE_DETAILS_CACHE_SIZE:
+                    _place_details_cache.popitem(last=False)
+        return details
+
+    def _fetch_place_details(self, place_id: str) -> Dict[str, Any]:
+        """
+        Fetch place details with one field-masked Places API (new) call, mapped onto the old-API keys.
+        Falls back to the old API only when the new one returns nothing.
         """
         logger.info(f"Fetching details for place_id: {place_id}")
-        merged_details = {}
-
-        # Get details from old API
-        old_details = {}
-        for attempt in range(3):
-            try:
-                results = self.client.place(
-                    place_id=place_id,
-                    fields=[
-                        "place_id",
-                        "name",
-                        "business_status",
-                        "formatted_address",
-                        "address_component",
-                        "adr_address",
-                        "vicinity",
-                        "plus_code",
-                        "utc_offset",
-                        "formatted_phone_number",
-                        "international_phone_number",
-                        "website",
-                        "url",
-                        "geometry",
-                        "opening_hours",
-                        "current_opening_hours",
-                        "secondary_opening_hours",
-                        "rating",
-                        "user_ratings_total",
-                        "price_level",
-                        "reviews",
-                        "photo",
-                        "icon",
-                        "editorial_summary",
-                        "reservable",
-                        "curbside_pickup",
-                        "delivery",
-                        "dine_in",
-                        "takeout",
-                        "wheelchair_accessible_entrance",
-                        "serves_breakfast",
-                        "serves_lunch",
-                        "serves_dinner",
-                        "serves_beer",
-                        "serves_wine",
-                        "serves_brunch",
-                        "permanently_closed",
-                        "type"
-                    ]
-                )
-                old_details = results.get("result", {})
-                logger.info(f"Old API returned details with keys: {list(old_details.keys())}")
-                break
-            except Exception as e:
-                logger.error(f"Old API attempt {attempt + 1} failed for {place_id}: {e}")
-                if attempt < 2:
-                    time.sleep(2 ** attempt)
-
-        # Get details from new API
-        new_details = {}
-        for attempt in range(3):
-            try:
-                url = f"https://places.googleapis.com/v1/places/{place_id}"
-                params = {
-                    "fields": "types,primaryTypeDisplayName,displayName,shortFormattedAddress,googleMapsUri,parkingOptions,paymentOptions,accessibilityOptions",
-                    "key": self.api_key
-                }
-                response = requests.get(url, params=params)
-                if response.status_code == 200:
-                    new_details = response.json()
-                    logger.info(f"New API returned details with keys: {list(new_details.keys())}")
-                    break
-                else:
-                    logger.warning(f"New API attempt {attempt + 1} failed for {place_id}: {response.status_code} {response.text}")
-            except Exception as e:
-                logger.error(f"New API attempt {attempt + 1} failed for {place_id}: {e}")
-
-        # Merge details: prefer old API for most fields, add new API fields
-        merged_details.update(old_details)
+
+        new_details = self._fetch_new_details(place_id)
         if new_details:
-            merged_details['types'] = new_details.get('types', [])
-            merged_details['primaryTypeDisplayName'] = new_details.get('primaryTypeDisplayName', {})
-
-        # Ensure required fields from new API are present
-        required_new_api_fields = [
-            "types", "primaryTypeDisplayName", "displayName", "shortFormattedAddress",
-            "googleMapsUri", "parkingOptions", "paymentOptions", "accessibilityOptions"
-        ]
-        for field in required_new_api_fields:
-            if field not in merged_details:
-                merged_details[field] = None
+            merged_details = _legacy_details_from_v1(new_details)
+        else:
+            merged_details = self._fetch_old_details(place_id)
+            # Ensure required fields from new API are present
+            for field in _REQUIRED_NEW_API_FIELDS:
+                merged_details.setdefault(field, None)
 
         logger.info(f"Merged details for {place_id} has {len(merged_details)} fields")
         return merged_details
@@ -152,14 +409,8 @@ class GoogleClient:
 
         google_place = None
         try:
-            if lat and lng:
-                results = self.client.places(query=query, location=(lat, lng))
-            else:
-                results = self.client.places(query=query)
-            candidates = results.get("results", [])
-            logger.info(f"Google search returned {len(candidates)} candidates for '{query}'")
-            if candidates:
-                google_place = candidates[0]
+            google_place = self._find_first_place(query, lat, lng)
+            if google_place:
                 logger.info(f"Selected first candidate: {google_place.get('name')} (place_id: {google_place.get('place_id')})")
             else:
                 logger.warning(f"No Google candidates found for '{query}'")
@@ -176,21 +427,11 @@ class GoogleClient:
 
         enriched = yelp_business.copy()
 
-        # Define generic types to filter out
-        generic_types = {
-            "establishment", "point_of_interest", "food", "drink", "store", "health",
-            "place_of_worship", "locality", "political", "geocode", "premise",
-            "street_address", "intersection", "postal_code", "country",
-            "administrative_area_level_1", "administrative_area_level_2",
-            "administrative_area_level_3", "colloquial_area", "sublocality",
-            "neighborhood", "route", "street_number", "floor", "room"
-        }
-
         # Get types and type from new API if available, otherwise from search
         if details.get('types'):
-            actual_types = [t for t in details['types'] if t not in generic_types]
+            actual_types = _specific_types(details['types'])
             enriched['types'] = actual_types
-            primary_type_display = details.get('primaryTypeDisplayName', {}).get('text', '')
+            primary_type_display = (details.get('primaryTypeDisplayName') or {}).get('text', '')
             if primary_type_display:
                 enriched['type'] = primary_type_display
             else:
@@ -199,36 +440,18 @@ class GoogleClient:
         else:
             # Fallback to search result
             if 'types' in google_place and google_place['types']:
-                actual_types = [t for t in google_place['types'] if t not in generic_types]
+                actual_types = _specific_types(google_place['types'])
                 enriched['types'] = actual_types
                 enriched['type'] = actual_types[0] if actual_types else None
 
         # Promote a curated subset to top-level only if missing from Yelp,
         # but preserve the full Google payload under google_enrichment.
-        promote_fields = [
-            "formatted_address",
-            "formatted_phone_number",
-            "international_phone_number",
-            "geometry",
-            "opening_hours",
-            "user_ratings_total",
-            "rating",
-            "website",
-            "business_status",
-        ]
-
-        for field in promote_fields:
-            if field in details and not enriched.get(field):
-                enriched[field] = details[field]
-
-        for field in promote_fields:
-            if field in details and not enriched.get(field):
-                enriched[field] = details[field]
+        enriched.update({field: details[field] for field in _PROMOTE_FIELDS if field in details and not enriched.get(field)})
 
         # Always store the entire Google details payload for full fidelity
-        # so we "capture all fields".
-        # To avoid accidental mutation, store a shallow copy.
-        enriched["google_enrichment"] = dict(details) if isinstance(details, dict) else details
+        # so we "capture all fields". get_place_details hands out a fresh dict per call,
+        # so it is stored as-is rather than copied again.
+        enriched["google_enrichment"] = details
 
         return enriched
 
@@ -277,6 +500,15 @@ class GoogleClient:
                 return normalize_homepage_url(url)
         return None
 
+@functools.lru_cache(maxsize=4)
+def get_default_client(api_key: Optional[str] = None) -> GoogleClient:
+    """
+    Return a shared GoogleClient per API key (GOOGLE_API_KEY by default).
+    Prefer this over constructing GoogleClient directly, so the googlemaps session, the pooled
+    Places session and its cache are reused across the whole process.
+    """
+    return GoogleClient(api_key)
+
 # Example usage (to be removed or placed in tests)
 if __name__ == "__main__":
     client = GoogleClient()
@@ -6,6 +6,7 @@ Hugging Face-based image classifier utilities.
 Public API:
 - classify_exterior_interior(image_url: str, timeout_s: Optional[float] = None) -> dict[str, float]
 - select_best_photo(photo_urls: list[str], timeout_s: Optional[float] = None, topk: Optional[int] = None) -> str | None
+- preload_classifier() -> bool
 
 Behavior:
 - Zero-shot image classification with candidate labels:
@@ -16,16 +17,26 @@ Behavior:
 """
 
 from typing import Optional, Dict, List, Tuple
+import atexit
+import gc
 import io
 import logging
 import time
 import os
+import re
 import string
+import threading
+from collections import OrderedDict
+from functools import lru_cache
 from difflib import SequenceMatcher
 from urllib.parse import urlparse
 from concurrent.futures import ThreadPoolExecutor, as_completed
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+import PIL
 from PIL import Image  # Pillow input for HF pipelines that expect PIL.Image
+from PIL import features as pil_features
 
 import torch
 
@@ -36,21 +47,108 @@ except Exception:  # pragma: no cover
     CLIPModel = None
     Pipeline = object  # type: ignore
 
+try:
+    from rapidfuzz import fuzz  # type: ignore
+except Exception:  # pragma: no cover
+    fuzz = None
+
+try:
+    # Optional: in-process libtesseract; avoids a tesseract subprocess + traineddata load per image
+    from tesserocr import PyTessBaseAPI  # type: ignore
+except Exception:  # pragma: no cover
+    PyTessBaseAPI = None
+
 from project.reporting.config import get_report_config
 
 logger = logging.getLogger("project.libs.image_classifier")
 
+
+def _download_retry() -> Retry:
+    """Connect/read errors and 429/5xx are retried by urllib3 with exponential backoff (Retry-After honored)."""
+    kwargs = dict(total=3, backoff_factor=0.5, status_forcelist=[429, 500, 502, 503, 504])
+    try:
+        return Retry(backoff_jitter=0.25, **kwargs)
+    except TypeError:
+        # backoff_jitter needs urllib3 2.x
+        return Retry(**kwargs)
+
+
+# Shared session so the photos of one business reuse warm keep-alive connections to the same CDN
+_HTTP = requests.Session()
+_HTTP.headers.update({"Accept": "image/*"})
+_HTTP.mount("https://", HTTPAdapter(pool_connections=8, pool_maxsize=16, max_retries=_download_retry()))
+atexit.register(_HTTP.close)
+
+_PUNCT_TABLE = str.maketrans("", "", string.punctuation)
+# Grayscale threshold for OCR (p > 160 -> white) as a 256-entry lookup table applied in C
+_OCR_THRESHOLD_LUT = [0] * 161 + [255] * 95
+# Tesseract time grows with pixel count; signage stays legible well below full Places resolution
+_OCR_MAX_SIDE = 1024
+
+# Concurrent OCR jobs across the stage-1 threads; Tesseract is single-threaded and CPU-bound,
+# so more than ~half the cores only oversubscribes them
+_OCR_WORKERS = max(1, (os.cpu_count() or 2) // 2)
+_ocr_slots = threading.BoundedSemaphore(_OCR_WORKERS)
+# Idle persistent tesserocr engines (at most _OCR_WORKERS); an engine serves one thread at a time
+# and releases the GIL while recognizing, so engines run in parallel
+_tess_idle: List["PyTessBaseAPI"] = []
+_tess_idle_lock = threading.Lock()
+# Set when a tesserocr engine can't be constructed (e.g. tessdata not found); OCR then goes
+# through pytesseract, as it does when tesserocr isn't installed
+_tesserocr_failed = False
+
 _labels_verbose = ["exterior of building", "interior of building", "food item"]
 
+# CLIP's processor resizes the shortest side to 224 and center-crops; decoding/shrinking to this
+# size first keeps that step (Python bicubic over the full frame) off multi-megapixel photos
+_CLIP_PRESIZE = 256
+
+# Stage-1 pool in select_best_photo only waits on the network (and the OCR subprocess/engine),
+# so it can run well past the core count; inference stays on the calling thread
+_DOWNLOAD_WORKERS = 16
+# Attempts at reading a photo body whose headers already arrived (see _download_image_bytes)
+_BODY_READ_ATTEMPTS = 3
+
+# URL-only early exit in select_best_photo: filename matches the business name this well and the
+# path mentions the outside of the building ("front" also covers "storefront")
+_URL_NAME_EXIT_SCORE = 0.8
+# A filename matching the name this well already settles the name match, so OCR is skipped
+_URL_NAME_SKIP_OCR_SCORE = 0.7
+# Whole path tokens (split on "/", "-", "_", "." etc.), so "frontdesk" or "showroom" never read as
+# "front"/"room"; a path naming both sides (e.g. "front-counter") gives no hint either way
+_URL_TOKEN_SPLIT = re.compile(r"[^a-z0-9]+")
+_EXT_URL_TOKENS = frozenset({"exterior", "storefront", "outside", "front", "facade"})
+_INT_URL_TOKENS = frozenset({
+    "interior", "inside", "dining", "lobby", "room", "counter", "desk", "bar", "kitchen",
+    "showroom", "restroom", "bathroom",
+})
+# Filename separators read as spaces when matching a URL against the business name
+_URL_SEP_TABLE = str.maketrans({"-": " ", "_": " "})
+# A URL ending in one of these is trusted as an image even if the server labels it text/html
+_IMAGE_EXTENSIONS = (".jpg", ".jpeg", ".png", ".webp")
+
+_TORCH_DTYPES = {"float32": torch.float32, "bfloat16": torch.bfloat16, "float16": torch.float16}
+
 _model_singleton: Optional["CLIPModel"] = None
 _processor_singleton: Optional["CLIPProcessor"] = None
+# L2-normalized CLIP text embeddings of _labels_verbose; the labels never change, so encode them once
+_text_features_singleton: Optional["torch.Tensor"] = None
+# (shortest_edge, crop, scale, bias) replicating the CLIP image processor as one affine pass;
+# None means fall back to calling the processor
+_pixel_transform: Optional[Tuple[int, int, "torch.Tensor", "torch.Tensor"]] = None
+# Per-URL LRU of (exterior, interior, food) scores, bounded by CLASSIFIER_CACHE_SIZE; only
+# successful classifications are stored
+_scores_cache: "OrderedDict[str, Tuple[float, float, float]]" = OrderedDict()
+_scores_cache_lock = threading.Lock()
+# Serializes the first load so concurrent callers don't each run from_pretrained
+_model_lock = threading.Lock()
 
 
 def _normalize_text(s: str) -> str:
     try:
         s = s.lower().strip()
         # remove punctuation
-        s = s.translate(str.maketrans("", "", string.punctuation))
+        s = s.translate(_PUNCT_TABLE)
         # collapse whitespace
         s = " ".join(s.split())
         return s
@@ -58,42 +156,84 @@ def _normalize_text(s: str) -> str:
         return s.lower().strip()
 
 
-def _similarity(a: str, b: str) -> float:
+def _name_similarities(texts: List[str], business_name: str) -> List[float]:
+    """
+    Similarity of each text to business_name on normalized text: rapidfuzz's C++ Indel ratio when
+    installed, difflib.SequenceMatcher otherwise. The name is normalized once for the whole batch.
+    Returns floats in [0,1], aligned with texts.
+    """
+    name_n = _normalize_text(business_name)
+    if not name_n:
+        return [0.0] * len(texts)
+    out: List[float] = []
+    for text in texts:
+        try:
+            t_n = _normalize_text(text)
+            if not t_n:
+                out.append(0.0)
+            elif fuzz is not None:
+                out.append(fuzz.ratio(t_n, name_n) / 100.0)
+            else:
+                out.append(float(SequenceMatcher(None, t_n, name_n).ratio()))
+        except Exception:
+            out.append(0.0)
+    return out
+
+
+def _tesserocr_image_to_string(img: "Image.Image") -> str:
     """
-    Lightweight similarity using difflib.SequenceMatcher on normalized text.
-    Returns a float in [0,1].
+    OCR on an idle pooled tesserocr engine, creating one when none is free.
+    Falls back to pytesseract (and stays there) when an engine can't be constructed.
     """
+    global _tesserocr_failed
+    with _tess_idle_lock:
+        api = _tess_idle.pop() if _tess_idle else None
+    if api is None:
+        try:
+            api = PyTessBaseAPI()
+        except Exception as e:
+            with _tess_idle_lock:
+                first_failure = not _tesserocr_failed
+                _tesserocr_failed = True
+            if first_failure:
+                logger.warning("tesserocr engine unavailable (%s); falling back to pytesseract", e)
+            import pytesseract  # type: ignore
+            return pytesseract.image_to_string(img)
     try:
-        a_n = _normalize_text(a)
-        b_n = _normalize_text(b)
-        if not a_n or not b_n:
-            return 0.0
-        return float(SequenceMatcher(None, a_n, b_n).ratio())
-    except Exception:
-        return 0.0
+        api.SetImage(img)
+        return api.GetUTF8Text()
+    finally:
+        with _tess_idle_lock:
+            _tess_idle.append(api)
 
 
 def _extract_image_text(pil_img: "Image.Image") -> str:
     """
-    Best-effort OCR using pytesseract if available.
+    Best-effort OCR using tesserocr (pooled in-process engines) or pytesseract if available.
     - Accepts PIL.Image and returns lowercased detected text.
     - Gracefully handles ImportError and runtime errors by returning "".
     - Simple preprocessing only via Pillow (grayscale, basic threshold).
     """
+    if PyTessBaseAPI is not None and not _tesserocr_failed:
+        image_to_string = _tesserocr_image_to_string
+    else:
+        try:
+            import pytesseract  # type: ignore
+        except Exception:
+            logger.info("OCR unavailable; skipping text match")
+            return ""
+        image_to_string = pytesseract.image_to_string
     try:
-        import pytesseract  # type: ignore
-    except Exception:
-        logger.info("OCR unavailable; skipping text match")
-        return ""
-    try:
-        img = pil_img.convert("L")  # grayscale
+        img = pil_img.convert("L")  # grayscale (a copy, so the caller's image is untouched)
+        img.thumbnail((_OCR_MAX_SIDE, _OCR_MAX_SIDE))
         # simple threshold to bump contrast a bit
         try:
-            img = img.point(lambda p: 255 if p > 160 else 0)
+            img = img.point(_OCR_THRESHOLD_LUT)
         except Exception:
             # if point fails for some mode, ignore and use grayscale
             pass
-        text = pytesseract.image_to_string(img) or ""
+        with _ocr_slots:
+            text = image_to_string(img) or ""
         return _normalize_text(text)
     except Exception:
         # Any OCR failure should not break selection logic
@@ -112,80 +252,297 @@ def _get_model_and_processor():
 
     This loads models locally via transformers. No external HF Hub token is required.
     """
-    global _model_singleton, _processor_singleton
+    global _model_singleton, _processor_singleton, _text_features_singleton, _pixel_transform
     if _model_singleton is not None and _processor_singleton is not None:
         return _model_singleton, _processor_singleton
 
-    cfg = get_report_config()
-    if CLIPModel is None or CLIPProcessor is None:
-        raise ClassifierError("CLIPModel or CLIPProcessor not available")
+    with _model_lock:
+        if _model_singleton is not None and _processor_singleton is not None:
+            return _model_singleton, _processor_singleton
+
+        cfg = get_report_config()
+        if CLIPModel is None or CLIPProcessor is None:
+            raise ClassifierError("CLIPModel or CLIPProcessor not available")
+
+        model_id = cfg.HF_MODEL_ID
+        # Build into locals and publish at the end, so the lock-free fast path above never
+        # sees a model without its processor/text features
+        try:
+            dtype = _TORCH_DTYPES.get(cfg.CLASSIFIER_DTYPE)
+            if dtype is None:
+                logger.warning("Unknown CLASSIFIER_DTYPE=%s; using float32", cfg.CLASSIFIER_DTYPE)
+                dtype = torch.float32
+            model = CLIPModel.from_pretrained(model_id, torch_dtype=dtype, device_map="cpu").eval()
+            processor = CLIPProcessor.from_pretrained(model_id)
+            with torch.inference_mode():
+                label_inputs = processor(text=_labels_verbose, return_tensors="pt", padding=True)
+                text_features = model.get_text_features(**label_inputs).float()
+                text_features = text_features / text_features.norm(dim=-1, keepdim=True)
+            # Only the vision tower (+ projection, logit_scale) runs per image from here on;
+            # drop the text tower so its weights don't stay resident
+            del model.text_model
+            del model.text_projection
+            gc.collect()
+            pixel_transform = _build_pixel_transform(processor)
+        except Exception as e:
+            logger.exception("Failed to initialize CLIP model and processor: %s", e)
+            if not cfg.CLASSIFIER_ENABLED:
+                raise ClassifierError("Classifier disabled by config") from e
+            os.environ["CLASSIFIER_ENABLED"] = "false"
+            raise ClassifierError("Failed to initialize CLIP model") from e
+
+        _text_features_singleton = text_features
+        _pixel_transform = pixel_transform
+        _processor_singleton = processor
+        _model_singleton = model
+        logger.info("Initialized CLIP model and processor model_id=%s dtype=%s", model_id, model.dtype)
+        # Decode/resize speed depends on the Pillow build (pillow-simd, libjpeg-turbo); record it once
+        try:
+            logger.info("Pillow %s libjpeg_turbo=%s", PIL.__version__, pil_features.check_feature("libjpeg_turbo"))
+        except Exception:
+            pass
+        return _model_singleton, _processor_singleton
+
+
+def preload_classifier() -> bool:
+    """
+    Load the CLIP singleton now instead of on the first classification.
+
+    Call once at process startup (before forking workers, e.g. with a preloading app server) so
+    the weights are loaded a single time and shared copy-on-write. Returns False when the
+    classifier is disabled or fails to load; never raises.
+    """
+    if not get_report_config().CLASSIFIER_ENABLED:
+        return False
+    try:
+        _get_model_and_processor()
+        return True
+    except ClassifierError as e:
+        logger.warning("Classifier preload failed: %s", e)
+        return False
 
-    model_id = cfg.HF_MODEL_ID
 
+def _build_pixel_transform(processor) -> Optional[Tuple[int, int, "torch.Tensor", "torch.Tensor"]]:
+    """
+    Read resize/crop/normalize settings from the CLIP image processor and fold rescale (1/255)
+    and normalize ((x - mean) / std) into one per-channel scale and bias.
+    Returns None for processor configs this fast path doesn't replicate.
+    """
     try:
-        _model_singleton = CLIPModel.from_pretrained(model_id, torch_dtype=torch.float32, device_map="cpu")
-        _model_singleton = _model_singleton.eval()
-        _processor_singleton = CLIPProcessor.from_pretrained(model_id)
+        ip = processor.image_processor
+        if not (ip.do_resize and ip.do_center_crop and ip.do_rescale and ip.do_normalize):
+            return None
+        if ip.resample != Image.BICUBIC or "shortest_edge" not in ip.size:
+            return None
+        if ip.crop_size["height"] != ip.crop_size["width"] or ip.size["shortest_edge"] < ip.crop_size["height"]:
+            return None
+        mean = torch.tensor(ip.image_mean, dtype=torch.float32).view(1, 3, 1, 1)
+        std = torch.tensor(ip.image_std, dtype=torch.float32).view(1, 3, 1, 1)
+        scale = ip.rescale_factor / std
+        bias = -mean / std
+        return int(ip.size["shortest_edge"]), int(ip.crop_size["height"]), scale, bias
     except Exception as e:
-        logger.exception("Failed to initialize CLIP model and processor: %s", e)
-        if not cfg.CLASSIFIER_ENABLED:
-            raise ClassifierError("Classifier disabled by config") from e
-        os.environ["CLASSIFIER_ENABLED"] = "false"
-        raise ClassifierError("Failed to initialize CLIP model") from e
+        logger.info("Using CLIPProcessor for pixel preprocessing: %s", e)
+        return None
 
-    logger.info("Initialized CLIP model and processor model_id=%s", model_id)
-    return _model_singleton, _processor_singleton
 
+def _pixel_values(images: List["Image.Image"]) -> "torch.Tensor":
+    """
+    CLIP image preprocessing without the processor: bicubic shortest-edge resize and center crop
+    in Pillow (C), then uint8 -> normalized float32 in a single fused multiply-add.
+    Matches CLIPImageProcessor's resize/crop geometry; returns (N, 3, crop, crop).
+    """
+    size, crop, scale, bias = _pixel_transform
+    batch = []
+    for img in images:
+        w, h = img.size
+        new_w, new_h = (size, int(size * h / w)) if w <= h else (int(size * w / h), size)
+        img = img.resize((new_w, new_h), Image.BICUBIC)
+        left, top = (new_w - crop) // 2, (new_h - crop) // 2
+        img = img.crop((left, top, left + crop, top + crop))
+        batch.append(torch.frombuffer(bytearray(img.tobytes()), dtype=torch.uint8).view(crop, crop, 3))
+    pixels = torch.stack(batch).permute(0, 3, 1, 2).contiguous()
+    return torch.addcmul(bias, pixels.float(), scale)
+
+
+def _image_logits(model, processor, images) -> "torch.Tensor":
+    """
+    Return CLIP logits_per_image of shape (len(images), len(_labels_verbose)).
 
-def _download_image_bytes(url: str, timeout_s: float) -> bytes:
+    Only the vision tower runs; images are scored against the cached label embeddings. The
+    processor is only called when _build_pixel_transform couldn't replicate it.
     """
-    Download bytes for an image URL with small retry/backoff.
-    Special-case Google Places Photo API redirect URLs by allowing redirects and
-    ensuring we ultimately fetch the binary content the HF pipeline expects.
+    if not isinstance(images, list):
+        images = [images]
+    if _pixel_transform is not None:
+        pixel_values = _pixel_values(images)
+    else:
+        pixel_values = processor(images=images, return_tensors="pt")["pixel_values"]
+    # Run the tower in the model's dtype (bf16/fp16 when configured); score in fp32
+    pixel_values = pixel_values.to(model.dtype)
+    image_features = model.get_image_features(pixel_values=pixel_values).float()
+    image_features = image_features / image_features.norm(dim=-1, keepdim=True)
+    return model.logit_scale.float().exp() * image_features @ _text_features_singleton.T
+
+
+class _BodyReadError(Exception):
+    """The response headers arrived but reading the body failed (read timeout, truncated chunk)."""
+
+
+def _download_image_bytes(url: str, timeout_s: float, max_bytes: int) -> bytes:
+    """
+    Download bytes for an image URL. Connect errors and 429/5xx are retried by the session's
+    urllib3 Retry; that only covers the request up to the response headers, so failures while
+    streaming the body get their own short retry here.
     """
-    last_exc: Exception | None = None
-    # 3 attempts with incremental backoff: 0s, 0.5s, 1.0s
-    for attempt in range(3):
+    attempt = 1
+    while True:
         try:
-            # Allow redirects; requests will follow the Google Photo API redirect to the actual CDN image.
-            r = requests.get(url, stream=True, timeout=timeout_s, allow_redirects=True)
-            r.raise_for_status()
-            # Some endpoints may respond with HTML if key/params are wrong; add a simple guard
-            content_type = r.headers.get("Content-Type", "").lower()
-            if "text/html" in content_type and not url.lower().endswith((".jpg", ".jpeg", ".png", ".webp")):
-                # Try to resolve final URL and re-fetch as binary without stream to simplify edge servers
-                final_url = r.url
-                rr = requests.get(final_url, timeout=timeout_s)
-                rr.raise_for_status()
-                return rr.content
-            return r.content
-        except Exception as e:
-            last_exc = e
-            # brief backoff then retry
-            try:
-                time.sleep(0.5 * attempt)
-            except Exception:
-                pass
-            logger.warning("Image download attempt %d failed for url=%s err=%s", attempt + 1, url, e)
-    # After retries, re-raise
-    assert last_exc is not None
-    raise last_exc
-
-
-def _classify_with_retry(url: str, timeout_s: Optional[float] = None) -> Dict[str, float]:
-    """Classify with retry logic for multi-threading."""
-    last_exc: Exception | None = None
-    for attempt in range(3):
+            return _fetch_image_bytes(url, timeout_s, max_bytes)
+        except _BodyReadError as e:
+            if attempt >= _BODY_READ_ATTEMPTS:
+                raise e.__cause__
+            logger.info("Retrying image body read url=%s attempt=%d err=%s", url, attempt, e.__cause__)
+            time.sleep(0.5 * attempt)
+            attempt += 1
+
+
+def _fetch_image_bytes(url: str, timeout_s: float, max_bytes: int) -> bytes:
+    """
+    One streamed GET of an image URL.
+    Special-case Google Places Photo API redirect URLs by allowing redirects and
+    ensuring we ultimately fetch the binary content the classifier expects.
+
+    The response is streamed so HTML pages and bodies over max_bytes are rejected from the
+    headers (or as soon as the limit is crossed) without reading the rest.
+    """
+    # Allow redirects; requests will follow the Google Photo API redirect to the actual CDN image.
+    with _HTTP.get(url, timeout=timeout_s, allow_redirects=True, stream=True) as r:
+        r.raise_for_status()
+        # Some endpoints may respond with HTML if key/params are wrong; r.url is already the
+        # post-redirect URL, so fetching it again would return the same page
+        content_type = r.headers.get("Content-Type", "").lower()
+        if "text/html" in content_type and not url.lower().endswith(_IMAGE_EXTENSIONS):
+            raise ValueError(f"Expected image, got {content_type} from {r.url} after {len(r.history)} redirect(s)")
+        declared = r.headers.get("Content-Length", "")
+        if declared.isdigit() and int(declared) > max_bytes:
+            raise ValueError(f"Image too large ({declared} bytes > {max_bytes}) at {r.url}")
+        body = bytearray()
         try:
-            return classify_exterior_interior(url, timeout_s=timeout_s)
-        except Exception as e:
-            last_exc = e
-            try:
-                time.sleep(0.5 * attempt)
-            except Exception:
-                pass
-    assert last_exc is not None
-    raise last_exc
+            for chunk in r.iter_content(chunk_size=64 * 1024):
+                body += chunk
+                if len(body) > max_bytes:
+                    raise ValueError(f"Image exceeds {max_bytes} bytes at {r.url}")
+        except (requests.exceptions.ChunkedEncodingError, requests.exceptions.ConnectionError, requests.exceptions.Timeout) as e:
+            raise _BodyReadError(str(e)) from e
+        return bytes(body)
+
+
+def _cached_scores(url: str) -> Optional[Dict[str, float]]:
+    """Return a copy of the cached scores for url (refreshing its LRU position), or None."""
+    with _scores_cache_lock:
+        hit = _scores_cache.get(url)
+        if hit is None:
+            return None
+        _scores_cache.move_to_end(url)
+    return dict(zip(("exterior", "interior", "food"), hit))
+
+
+def _store_scores(url: str, scores_map: Dict[str, float], max_size: int) -> None:
+    if max_size <= 0:
+        return
+    with _scores_cache_lock:
+        _scores_cache[url] = (scores_map["exterior"], scores_map["interior"], scores_map["food"])
+        _scores_cache.move_to_end(url)
+        while len(_scores_cache) > max_size:
+            _scores_cache.popitem(last=False)
+
+
+def _scores_from_probs(probs: List[float]) -> Dict[str, float]:
+    """Map softmax probabilities over _labels_verbose to {'exterior', 'interior', 'food'} scores."""
+    scores_map: Dict[str, float] = {"exterior": 0.0, "interior": 0.0, "food": 0.0}
+    for label, score in zip(_labels_verbose, probs):
+        if "exterior" in label:
+            scores_map["exterior"] = max(scores_map["exterior"], float(score))
+        elif "interior" in label:
+            scores_map["interior"] = max(scores_map["interior"], float(score))
+        elif "food" in label:
+            scores_map["food"] = max(scores_map["food"], float(score))
+    return scores_map
+
+
+@lru_cache(maxsize=2048)
+def _url_path(u: str) -> str:
+    """Path component of a photo URL; select_best_photo looks at each URL's path several times."""
+    return urlparse(u).path or ""
+
+
+def _heuristic_url_text(u: str) -> str:
+    """Normalized filename of a photo URL (no extension, separators as spaces) for name matching."""
+    try:
+        # take last segment
+        filename = _url_path(u).split("/")[-1]
+        # strip extension
+        name = filename.rsplit(".", 1)[0]
+        # replace separators with spaces
+        name = name.replace("%20", " ").translate(_URL_SEP_TABLE)
+        return _normalize_text(name)
+    except Exception:
+        return ""
+
+
+def _url_scene_hint(u: str) -> int:
+    """+1 if the URL path names the outside of a building, -1 if it names the inside, else 0."""
+    try:
+        path = _url_path(u)
+    except Exception:
+        return 0
+    tokens = set(_URL_TOKEN_SPLIT.split(path.lower().replace("%20", " ")))
+    exterior = not tokens.isdisjoint(_EXT_URL_TOKENS)
+    interior = not tokens.isdisjoint(_INT_URL_TOKENS)
+    if exterior and not interior:
+        return 1
+    if interior and not exterior:
+        return -1
+    return 0
+
+
+def _load_image(url: str, timeout_s: float, max_bytes: int, draft: bool = True) -> "Image.Image":
+    """
+    Download an image once and decode it to RGB. The returned PIL image is shared by
+    CLIP and OCR so no caller ever fetches the same URL twice.
+
+    With draft=True JPEGs are decoded straight from the DCT at the smallest scale that still
+    covers _CLIP_PRESIZE; pass draft=False when the full resolution is needed for OCR.
+    """
+    img_bytes = _download_image_bytes(url, timeout_s, max_bytes)
+    try:
+        img = Image.open(io.BytesIO(img_bytes))
+        if draft and img.format == "JPEG":
+            img.draft("RGB", (_CLIP_PRESIZE, _CLIP_PRESIZE))
+        return img.convert("RGB")
+    except Exception as e:
+        logger.warning("Failed to load PIL image for url=%s err=%s", url, e)
+        raise ClassifierError("Failed to load image") from e
+
+
+def _clip_sized(img: "Image.Image") -> "Image.Image":
+    """Shrink so the shortest side is _CLIP_PRESIZE; the processor's 224 resize/crop then sees the same framing."""
+    w, h = img.size
+    scale = _CLIP_PRESIZE / float(min(w, h))
+    if scale >= 1.0:
+        return img
+    return img.resize((max(1, round(w * scale)), max(1, round(h * scale))), Image.BILINEAR, reducing_gap=2.0)
+
+
+def _load_candidate(url: str, timeout_s: float, max_bytes: int, with_ocr: bool) -> Tuple["Image.Image", str]:
+    """
+    Download and decode one candidate photo, plus OCR text when a business name is to be matched.
+    Runs on the I/O thread pool of select_best_photo; the download helper retries internally.
+    """
+    pil_img = _load_image(url, timeout_s, max_bytes, draft=not with_ocr)
+    ocr_text = _extract_image_text(pil_img) if with_ocr else ""
+    return _clip_sized(pil_img), ocr_text
 
 
 def classify_exterior_interior(image_url: str, timeout_s: Optional[float] = None) -> Dict[str, float]:
@@ -202,6 +559,10 @@ def classify_exterior_interior(image_url: str, timeout_s: Optional[float] = None
     if not cfg.CLASSIFIER_ENABLED:
         raise ClassifierError("Classifier disabled by config")
 
+    cached = _cached_scores(image_url)
+    if cached is not None:
+        return cached
+
     t0 = time.time()
     timeout = timeout_s if timeout_s is not None else cfg.CLASSIFIER_TIMEOUT_S
 
@@ -211,43 +572,24 @@ def classify_exterior_interior(image_url: str, timeout_s: Optional[float] = None
         raise
 
     # Download first to enforce our timeout deterministically with retries inside helper
-    img_bytes = _download_image_bytes(image_url, timeout)
-    img_buf = io.BytesIO(img_bytes)
-
-    # Load PIL image
-    try:
-        pil_img = Image.open(img_buf).convert("RGB")
-    except Exception as e:
-        logger.exception("Failed to load PIL image for url=%s", image_url)
-        raise ClassifierError("Failed to load image")
+    pil_img = _clip_sized(_load_image(image_url, timeout, cfg.CLASSIFIER_MAX_IMAGE_BYTES))
 
     # Perform CLIP zero-shot classification
     try:
-        inputs = processor(text=_labels_verbose, images=pil_img, return_tensors="pt", padding=True)
-        outputs = model(**inputs)
-        logits = outputs.logits_per_image  # shape (1, num_labels)
-        probs = logits.softmax(dim=1).squeeze(0).tolist()
-        result = [{"label": label, "score": score} for label, score in zip(_labels_verbose, probs)]
+        with torch.inference_mode():
+            logits = _image_logits(model, processor, pil_img)  # shape (1, num_labels)
+            probs = logits.softmax(dim=1).squeeze(0).tolist()
     except Exception as e:
         logger.exception("CLIP classification failed for url=%s", image_url)
         raise ClassifierError("CLIP classification failed")
 
-    scores_map: Dict[str, float] = {"exterior": 0.0, "interior": 0.0, "food": 0.0}
     try:
-        # result can be list of dicts: [{'label': '...', 'score': ...}, ...]
-        for item in result:
-            label = str(item.get("label", "")).strip().lower()
-            score = float(item.get("score", 0.0))
-            if "exterior" in label:
-                scores_map["exterior"] = max(scores_map["exterior"], score)
-            elif "interior" in label:
-                scores_map["interior"] = max(scores_map["interior"], score)
-            elif "food" in label:
-                scores_map["food"] = max(scores_map["food"], score)
+        scores_map = _scores_from_probs(probs)
     except Exception as e:
         logger.exception("Classifier parsing error: %s", e)
         raise ClassifierError("Classifier output parse failed")
 
+    _store_scores(image_url, scores_map, cfg.CLASSIFIER_CACHE_SIZE)
     elapsed = (time.time() - t0) * 1000.0
     logger.info("Classified image ext=%.3f int=%.3f food=%.3f ms=%.1f url=%s",
                 scores_map["exterior"], scores_map["interior"], scores_map["food"], elapsed, image_url)
@@ -282,104 +624,120 @@ def select_best_photo(photo_urls: List[str], timeout_s: Optional[float] = None,
     best_ext_boosted: Tuple[float, Optional[str]] = (-1.0, None)
     best_int_boosted: Tuple[float, Optional[str]] = (-1.0, None)
 
-    any_success = False
-    # Helper to compute url_text heuristic
-    def _heuristic_url_text(u: str) -> str:
-        try:
-            parsed = urlparse(u)
-            path = parsed.path or ""
-            # take last segment
-            filename = path.split("/")[-1]
-            # strip extension
-            name = filename.rsplit(".", 1)[0]
-            # replace separators with spaces
-            name = name.replace("-", " ").replace("_", " ").replace("%20", " ")
-            return _normalize_text(name)
-        except Exception:
-            return ""
-
-    with ThreadPoolExecutor(max_workers=4) as executor:
-        future_to_url = {executor.submit(_classify_with_retry, url, timeout_s): url for url in photo_urls}
-        for future in as_completed(future_to_url):
-            url = future_to_url[future]
-            try:
-                scores = future.result()
-                any_success = True
-            except Exception as e:
-                logger.warning("Classifier failed for url=%s err=%s; skipping", url, e)
-                continue
-
-            ext, inte = scores.get("exterior", 0.0), scores.get("interior", 0.0)
-            food = scores.get("food", 0.0)
-
-            # Skip images where food item score is the highest
-            if food > ext and food > inte:
-                continue
-
-            # Compute name match score if business_name provided
-            if business_name:
-                name_match_score = 0.0
-                ocr_text = ""
-                try:
-                    timeout = timeout_s if timeout_s is not None else cfg.CLASSIFIER_TIMEOUT_S
-                    img_bytes = _download_image_bytes(url, timeout)
-                    try:
-                        pil_img = Image.open(io.BytesIO(img_bytes)).convert("RGB")
-                    except Exception:
-                        pil_img = None  # type: ignore
-                    if pil_img is not None:
-                        ocr_text = _extract_image_text(pil_img)
-                except Exception as ne:
-                    # Concise warning; OCR helper already logs when unavailable internally
-                    logger.warning("OCR error for url=%s err=%s; proceeding without text match", url, ne)
-                    ocr_text = ""
-
-                url_text = _heuristic_url_text(url)
-                try:
-                    sim_ocr = _similarity(ocr_text, business_name)
-                except Exception:
-                    sim_ocr = 0.0
-                try:
-                    sim_url = _similarity(url_text, business_name)
-                except Exception:
-                    sim_url = 0.0
-                name_match_score = max(sim_ocr, sim_url)
-            else:
-                name_match_score = 0.0
-
-            # Apply boosting - prioritize exterior over name match
-            boosted_ext = min(1.0, ext + 0.15 * name_match_score)
-            boosted_int = min(1.0, inte + 0.03 * name_match_score)
-
-            # Update raw best
-            if ext > best_ext[0]:
-                best_ext = (ext, url)
-            if inte > best_int[0]:
-                best_int = (inte, url)
-
-            # Update boosted best
-            if boosted_ext > best_ext_boosted[0]:
-                best_ext_boosted = (boosted_ext, url)
-            if boosted_int > best_int_boosted[0]:
-                best_int_boosted = (boosted_int, url)
-
-            # New short-circuit: require stronger evidence before immediate selection to avoid false positives
-            # Conditions (ALL must hold):
-            #  - Non-trivial name match (>= 0.35) via OCR/URL heuristic
-            #  - Exterior substantially exceeds interior by (margin + 0.10)
-            #  - Raw exterior confidence itself is at least 0.70
-            if business_name and name_match_score >= 0.35 and (ext - inte) >= (margin + 0.10) and ext >= 0.70:
-                logger.info("Short-circuit on strong exterior-with-name match url=%s name_score=%.2f ext=%.3f int=%.3f food=%.3f", url, name_match_score, ext, inte, food)
+    # Cheap pass before any download: a URL whose filename already names the business and whose
+    # path says it shows the front is taken as-is; otherwise name-like URLs are evaluated first
+    sim_url_by_url: Dict[str, float] = {}
+    if business_name:
+        url_sims = _name_similarities([_heuristic_url_text(u) for u in photo_urls], business_name)
+        sim_url_by_url = dict(zip(photo_urls, url_sims))
+        for url in photo_urls:
+            if sim_url_by_url[url] >= _URL_NAME_EXIT_SCORE and _url_scene_hint(url) > 0:
+                logger.info("Short-circuit on URL name+exterior hint url=%s name_score=%.2f skipped_clip=%d",
+                            url, sim_url_by_url[url], len(photo_urls))
                 return url
 
-            # Short-circuit using boosted scores for decisive exterior (tighten threshold slightly)
-            if (boosted_ext - boosted_int) >= (margin + 0.05) and boosted_ext >= 0.85 and ext >= 0.60:
-                logger.info("Short-circuit exterior selection (tight) url=%s ext=%.3f int=%.3f food=%.3f boosted_ext=%.3f boosted_int=%.3f", url, ext, inte, food, boosted_ext, boosted_int)
-                return url
+    timeout = timeout_s if timeout_s is not None else cfg.CLASSIFIER_TIMEOUT_S
+    candidates = list(dict.fromkeys(photo_urls))
+    scores_by_url: Dict[str, Dict[str, float]] = {}
+    for url in candidates:
+        hit = _cached_scores(url)
+        if hit is not None:
+            scores_by_url[url] = hit
+    # OCR only where the URL alone doesn't already match the name; cached URLs are only
+    # fetched again for that OCR text
+    needs_ocr = {u for u in candidates if business_name and sim_url_by_url.get(u, 0.0) < _URL_NAME_SKIP_OCR_SCORE}
+    to_load = [u for u in candidates if u in needs_ocr or u not in scores_by_url]
+
+    # Stage 1 (I/O-bound): download, decode and OCR every candidate on a thread pool
+    loaded: Dict[str, Tuple["Image.Image", str]] = {}
+    if to_load:
+        with ThreadPoolExecutor(max_workers=min(_DOWNLOAD_WORKERS, len(to_load))) as executor:
+            future_to_url = {executor.submit(_load_candidate, url, timeout, cfg.CLASSIFIER_MAX_IMAGE_BYTES, url in needs_ocr): url for url in to_load}
+            for future in as_completed(future_to_url):
+                url = future_to_url[future]
+                try:
+                    loaded[url] = future.result()
+                except Exception as e:
+                    logger.warning("Classifier failed for url=%s err=%s; skipping", url, e)
 
-            # Per-URL log when name provided
-            if business_name:
-                logger.info("Name match score=%.2f boosted_ext=%.2f boosted_int=%.2f food=%.3f url=%s", name_match_score, boosted_ext, boosted_int, food, url)
+    # Stage 2 (compute-bound): one batched vision forward over the decoded images not in the cache
+    to_infer = [u for u in candidates if u in loaded and u not in scores_by_url]
+    if to_infer:
+        try:
+            model, processor = _get_model_and_processor()
+            with torch.inference_mode():
+                logits = _image_logits(model, processor, [loaded[u][0] for u in to_infer])  # shape (N, num_labels)
+                rows = logits.softmax(dim=1).tolist()
+            for u, p in zip(to_infer, rows):
+                scores_by_url[u] = _scores_from_probs(p)
+                _store_scores(u, scores_by_url[u], cfg.CLASSIFIER_CACHE_SIZE)
+        except ClassifierError as e:
+            logger.warning("Classifier unavailable err=%s; falling back to first photo", e)
+            return photo_urls[0]
+        except Exception as e:
+            logger.exception("Batched CLIP classification failed: %s", e)
+
+    urls = [u for u in candidates if u in scores_by_url]
+    sim_ocr_by_url: Dict[str, float] = {}
+    if business_name:
+        ocr_urls = [u for u in urls if u in loaded and loaded[u][1]]
+        sim_ocr_by_url = dict(zip(ocr_urls, _name_similarities([loaded[u][1] for u in ocr_urls], business_name)))
+    # Evaluate likely winners first so the short-circuits below fire early: best URL-name match,
+    # then exterior-looking paths ahead of interior-looking ones (stable, so ties keep caller order)
+    urls.sort(key=lambda u: (sim_url_by_url.get(u, 0.0), _url_scene_hint(u)), reverse=True)
+    scored: List[Tuple[str, Dict[str, float]]] = [(u, scores_by_url[u]) for u in urls]
+    any_success = bool(scored)
+
+    # Stage 3: apply boosting and short-circuit rules
+    for url, scores in scored:
+        ext, inte = scores.get("exterior", 0.0), scores.get("interior", 0.0)
+        food = scores.get("food", 0.0)
+
+        # Skip images where food item score is the highest
+        if food > ext and food > inte:
+            continue
+
+        # Compute name match score if business_name provided
+        if business_name:
+            sim_ocr = sim_ocr_by_url.get(url, 0.0)
+            sim_url = sim_url_by_url.get(url, 0.0)
+            name_match_score = max(sim_ocr, sim_url)
+        else:
+            name_match_score = 0.0
+
+        # Apply boosting - prioritize exterior over name match
+        boosted_ext = min(1.0, ext + 0.15 * name_match_score)
+        boosted_int = min(1.0, inte + 0.03 * name_match_score)
+
+        # Update raw best
+        if ext > best_ext[0]:
+            best_ext = (ext, url)
+        if inte > best_int[0]:
+            best_int = (inte, url)
+
+        # Update boosted best
+        if boosted_ext > best_ext_boosted[0]:
+            best_ext_boosted = (boosted_ext, url)
+        if boosted_int > best_int_boosted[0]:
+            best_int_boosted = (boosted_int, url)
+
+        # New short-circuit: require stronger evidence before immediate selection to avoid false positives
+        # Conditions (ALL must hold):
+        #  - Non-trivial name match (>= 0.35) via OCR/URL heuristic
+        #  - Exterior substantially exceeds interior by (margin + 0.10)
+        #  - Raw exterior confidence itself is at least 0.70
+        if business_name and name_match_score >= 0.35 and (ext - inte) >= (margin + 0.10) and ext >= 0.70:
+            logger.info("Short-circuit on strong exterior-with-name match url=%s name_score=%.2f ext=%.3f int=%.3f food=%.3f", url, name_match_score, ext, inte, food)
+            return url
+
+        # Short-circuit using boosted scores for decisive exterior (tighten threshold slightly)
+        if (boosted_ext - boosted_int) >= (margin + 0.05) and boosted_ext >= 0.85 and ext >= 0.60:
+            logger.info("Short-circuit exterior selection (tight) url=%s ext=%.3f int=%.3f food=%.3f boosted_ext=%.3f boosted_int=%.3f", url, ext, inte, food, boosted_ext, boosted_int)
+            return url
+
+        # Per-URL log when name provided
+        if business_name:
+            logger.info("Name match score=%.2f boosted_ext=%.2f boosted_int=%.2f food=%.3f url=%s", name_match_score, boosted_ext, boosted_int, food, url)
 
     # Post-loop selection with safer preference:
     # 1) Prefer boosted exterior if reasonably confident and advantaged
@@ -1,26 +1,94 @@
 import os
+import re
+import time
+import asyncio
+import hashlib
 import logging
-from openai import OpenAI
+import threading
+from collections import OrderedDict
+import httpx
+from openai import OpenAI, AsyncOpenAI
 
 logger = logging.getLogger(__name__)
 
 OPENROUTER_API_KEY = os.getenv("OPENROUTER_API_KEY")
 
-# Create a reusable OpenRouter client
+_MODEL = "meta-llama/llama-3.3-70b-instruct"
+_ATTEMPTS = 3
+
+_WORD_RE = re.compile(r"\w+")
+# Page text scanned for summaries, and the cleaned text actually sent; a one-sentence summary
+# never needs more, and bounding both keeps the regex scan and request body small on huge pages.
+_SUMMARY_SCAN_CHARS = 32_000
+_SUMMARY_PROMPT_CHARS = 12_000
+
+# Successful classify/summarize answers keyed by (kind, url, sha1 of the input text), so regenerated
+# reports and repeated pipeline runs in one process skip identical LLM round-trips. Hashing the
+# text keeps large page content out of the keys.
+_RESULT_CACHE_SIZE = 8192
+_result_cache: "OrderedDict[tuple, str]" = OrderedDict()
+_result_cache_lock = threading.Lock()
+
+# Keep-alive pool sized for bursts of concurrent page summaries; a bounded timeout so a stalled
+# completion can't pin a pooled connection for the SDK's 10-minute default
+_HTTP_LIMITS = httpx.Limits(max_connections=256, max_keepalive_connections=128)
+_HTTP_TIMEOUT = httpx.Timeout(30.0, connect=5.0)
+
+
+def _build_http_clients():
+    """
+    Build the process-wide (sync, async) httpx clients behind the OpenRouter SDK clients.
+    Uses HTTP/2 (one multiplexed connection) when the h2 package is installed, pooled HTTP/1.1 otherwise.
+    """
+    try:
+        return (
+            httpx.Client(http2=True, limits=_HTTP_LIMITS, timeout=_HTTP_TIMEOUT),
+            httpx.AsyncClient(http2=True, limits=_HTTP_LIMITS, timeout=_HTTP_TIMEOUT),
+        )
+    except ImportError as e:
+        logger.info(f"HTTP/2 unavailable for OpenRouter ({e}); using pooled HTTP/1.1")
+        return (
+            httpx.Client(limits=_HTTP_LIMITS, timeout=_HTTP_TIMEOUT),
+            httpx.AsyncClient(limits=_HTTP_LIMITS, timeout=_HTTP_TIMEOUT),
+        )
+
+
+# Create reusable OpenRouter clients; the async one lets callers overlap many page round-trips
 client = None
+aclient = None
 if OPENROUTER_API_KEY:
     try:
-        client = OpenAI(api_key=OPENROUTER_API_KEY, base_url="https://openrouter.ai/api/v1")
+        _http, _ahttp = _build_http_clients()
+        client = OpenAI(api_key=OPENROUTER_API_KEY, base_url="https://openrouter.ai/api/v1", http_client=_http)
+        aclient = AsyncOpenAI(api_key=OPENROUTER_API_KEY, base_url="https://openrouter.ai/api/v1", http_client=_ahttp)
     except Exception as e:
         logger.error(f"Failed to create OpenRouter client: {e}")
         client = None
+        aclient = None
 
 
-def classify_page(url: str, summary: str) -> str:
-    """Classify page type using OpenRouter"""
-    if not client:
-        return "Other"
+def _cache_key(kind: str, url: str, text: str) -> tuple:
+    return (kind, url, hashlib.sha1(text.encode("utf-8", "replace")).hexdigest())
+
+
+def _cache_get(key: tuple):
+    with _result_cache_lock:
+        value = _result_cache.get(key)
+        if value is not None:
+            _result_cache.move_to_end(key)
+        return value
+
+
+def _cache_put(key: tuple, value: str) -> str:
+    with _result_cache_lock:
+        _result_cache[key] = value
+        _result_cache.move_to_end(key)
+        while len(_result_cache) > _RESULT_CACHE_SIZE:
+            _result_cache.popitem(last=False)
+    return value
+
 
+def _classify_messages(url: str, summary: str) -> list:
     system_instruction = (
         "You are a page classifier for sites. "
         "Classify the page into exactly one canonical category term. "
@@ -29,36 +97,22 @@ def classify_page(url: str, summary: str) -> str:
         "If uncertain, output Other."
     )
     user_prompt = f"URL: {url}\nSummary: {summary}"
+    return [
+        {"role": "system", "content": system_instruction},
+        {"role": "user", "content": user_prompt},
+    ]
 
-    import time
-    for attempt in range(3):
-        try:
-            resp = client.chat.completions.create(
-                model="meta-llama/llama-3.3-70b-instruct",
-                messages=[
-                    {"role": "system", "content": system_instruction},
-                    {"role": "user", "content": user_prompt},
-                ],
-                max_tokens=5,
-            )
-            classification = resp.choices[0].message.content.strip()
-            if not classification:
-                raise ValueError("Empty response from OpenRouter")
-            if " " in classification or "\n" in classification or not classification.isalpha():
-                return "Other"
-            return classification
-        except Exception as e:
-            logger.error(f"Error classifying page {url} (attempt {attempt+1}/3): {e}", exc_info=True)
-            if attempt < 2:
-                time.sleep(2 * (attempt + 1))
-    return "Other"
 
+def _parse_classification(resp) -> str:
+    classification = resp.choices[0].message.content.strip()
+    if not classification:
+        raise ValueError("Empty response from OpenRouter")
+    if " " in classification or "\n" in classification or not classification.isalpha():
+        return "Other"
+    return classification
 
-def summarize_page(url: str, content: str) -> str:
-    """Summarize page in one line using OpenRouter"""
-    if not client:
-        return ""
 
+def _summarize_messages(url: str, content: str) -> list:
     system_instruction = (
         "You write one-sentence summaries of webpages stating what it is about. "
         "Focus only on the main subject or purpose of the page. "
@@ -66,35 +120,118 @@ def summarize_page(url: str, content: str) -> str:
         "Avoid marketing language and avoid lists. "
         "Output exactly one sentence without quotes."
     )
-    import re
-    words = re.findall(r"\w+", content)
-    cleaned_content = " ".join(words)
+    words = _WORD_RE.findall(content[:_SUMMARY_SCAN_CHARS])
+    cleaned_content = " ".join(words)[:_SUMMARY_PROMPT_CHARS]
     user_prompt = (
         "Summarize the following based on the URL and content below.\n\n"
         f"URL: {url}\n"
         f"Content: {cleaned_content}"
     )
+    return [
+        {"role": "system", "content": system_instruction},
+        {"role": "user", "content": user_prompt},
+    ]
+
 
-    import time
-    for attempt in range(3):
+def _parse_summary(resp) -> str:
+    content = resp.choices[0].message.content.strip()
+    if not content:
+        raise ValueError("Empty response from OpenRouter")
+    return content
+
+
+def _call_with_retry(messages: list, max_tokens: int, parse, what: str):
+    """Run one chat completion through parse, retrying with backoff; None once every attempt failed."""
+    for attempt in range(_ATTEMPTS):
         try:
-            resp = client.chat.completions.create(
-                model="meta-llama/llama-3.3-70b-instruct",
-                messages=[
-                    {"role": "system", "content": system_instruction},
-                    {"role": "user", "content": user_prompt},
-                ],
-                max_tokens=100,
-            )
-            content = resp.choices[0].message.content.strip()
-            if not content:
-                raise ValueError("Empty response from OpenRouter")
-            return content
+            resp = client.chat.completions.create(model=_MODEL, messages=messages, max_tokens=max_tokens)
+            return parse(resp)
         except Exception as e:
-            logger.error(f"Error summarizing page {url} (attempt {attempt+1}/3): {e}", exc_info=True)
-            if attempt < 2:
+            logger.error(f"Error {what} (attempt {attempt+1}/{_ATTEMPTS}): {e}", exc_info=True)
+            if attempt < _ATTEMPTS - 1:
                 time.sleep(2 * (attempt + 1))
-    return ""
+    return None
+
+
+async def _acall_with_retry(messages: list, max_tokens: int, parse, what: str):
+    """Async _call_with_retry on the shared AsyncOpenAI client."""
+    for attempt in range(_ATTEMPTS):
+        try:
+            resp = await aclient.chat.completions.create(model=_MODEL, messages=messages, max_tokens=max_tokens)
+            return parse(resp)
+        except Exception as e:
+            logger.error(f"Error {what} (attempt {attempt+1}/{_ATTEMPTS}): {e}", exc_info=True)
+            if attempt < _ATTEMPTS - 1:
+                await asyncio.sleep(2 * (attempt + 1))
+    return None
+
+
+def classify_page(url: str, summary: str) -> str:
+    """Classify page type using OpenRouter"""
+    if not client:
+        return "Other"
+
+    key = _cache_key("classify", url, summary)
+    cached = _cache_get(key)
+    if cached is not None:
+        return cached
+    messages = _classify_messages(url, summary)
+
+    result = _call_with_retry(messages, 5, _parse_classification, f"classifying page {url}")
+    if result is None:
+        return "Other"
+    return _cache_put(key, result)
+
+
+async def aclassify_page(url: str, summary: str) -> str:
+    """Async classify_page; awaiting it does not block the event loop during the round-trip."""
+    if not aclient:
+        return "Other"
+
+    key = _cache_key("classify", url, summary)
+    cached = _cache_get(key)
+    if cached is not None:
+        return cached
+    messages = _classify_messages(url, summary)
+
+    result = await _acall_with_retry(messages, 5, _parse_classification, f"classifying page {url}")
+    if result is None:
+        return "Other"
+    return _cache_put(key, result)
+
+
+def summarize_page(url: str, content: str) -> str:
+    """Summarize page in one line using OpenRouter"""
+    if not client:
+        return ""
+
+    key = _cache_key("summarize", url, content)
+    cached = _cache_get(key)
+    if cached is not None:
+        return cached
+    messages = _summarize_messages(url, content)
+
+    result = _call_with_retry(messages, 100, _parse_summary, f"summarizing page {url}")
+    if result is None:
+        return ""
+    return _cache_put(key, result)
+
+
+async def asummarize_page(url: str, content: str) -> str:
+    """Async summarize_page; awaiting it does not block the event loop during the round-trip."""
+    if not aclient:
+        return ""
+
+    key = _cache_key("summarize", url, content)
+    cached = _cache_get(key)
+    if cached is not None:
+        return cached
+    messages = _summarize_messages(url, content)
+
+    result = await _acall_with_retry(messages, 100, _parse_summary, f"summarizing page {url}")
+    if result is None:
+        return ""
+    return _cache_put(key, result)
 
 
 def generate_rank_summary(data: dict) -> str:
@@ -138,26 +275,14 @@ Focus on:
 Grid size and gap distance as the basis for analysis. Overall visibility and ranking performance with specific metrics (average rank, visibility coverage, valid rankings count). Geographic patterns and directional performance variations. Key competitors and their strengths. Areas with low visibility and strategic implications. Review volume comparison. Actionable strategic insights based on geographic data.
 """
     
-    import time
-    for attempt in range(3):
-        try:
-            resp = client.chat.completions.create(
-                model="meta-llama/llama-3.3-70b-instruct",
-                messages=[
-                    {"role": "system", "content": system_instruction},
-                    {"role": "user", "content": user_prompt},
-                ],
-                max_tokens=200,
-            )
-            content = resp.choices[0].message.content.strip()
-            if not content:
-                raise ValueError("Empty response from OpenRouter")
-            return content
-        except Exception as e:
-            logger.error(f"Error generating rank summary (attempt {attempt+1}/3): {e}", exc_info=True)
-            if attempt < 2:
-                time.sleep(2 * (attempt + 1))
-    return "Summary generation failed due to API error."
+    messages = [
+        {"role": "system", "content": system_instruction},
+        {"role": "user", "content": user_prompt},
+    ]
+    content = _call_with_retry(messages, 200, _parse_summary, "generating rank summary")
+    if content is None:
+        return "Summary generation failed due to API error."
+    return content
 
 
 def generate_business_summary(business_info: str) -> str:
@@ -174,23 +299,11 @@ def generate_business_summary(business_info: str) -> str:
     )
     user_prompt = business_info
 
-    import time
-    for attempt in range(3):
-        try:
-            resp = client.chat.completions.create(
-                model="meta-llama/llama-3.3-70b-instruct",
-                messages=[
-                    {"role": "system", "content": system_instruction},
-                    {"role": "user", "content": user_prompt},
-                ],
-                max_tokens=300,
-            )
-            content = resp.choices[0].message.content.strip()
-            if not content:
-                raise ValueError("Empty response from OpenRouter")
-            return content
-        except Exception as e:
-            logger.error(f"Error generating business summary (attempt {attempt+1}/3): {e}", exc_info=True)
-            if attempt < 2:
-                time.sleep(2 * (attempt + 1))
-    return "Summary generation failed due to API error."
\ No newline at end of file
+    messages = [
+        {"role": "system", "content": system_instruction},
+        {"role": "user", "content": user_prompt},
+    ]
+    content = _call_with_retry(messages, 300, _parse_summary, "generating business summary")
+    if content is None:
+        return "Summary generation failed due to API error."
+    return content
@@ -1,5 +1,6 @@
 import os
 import time
+import atexit
 import logging
 import requests
 import certifi
@@ -12,6 +13,10 @@ load_dotenv()
 YELP_API_KEY = os.getenv("YELP_API_KEY")
 YELP_API_BASE_URL = "https://api.yelp.com/v3"
 
+# Shared keep-alive session so search and detail calls reuse one TLS connection to the API
+_SESSION = requests.Session()
+atexit.register(_SESSION.close)
+
 
 logging.basicConfig(level=logging.INFO)
 
@@ -38,7 +43,7 @@ class YelpClient:
             "categories": category,
             "limit": limit
         }
-        response = requests.get(url, headers=self.headers, params=params, verify=certifi.where())
+        response = _SESSION.get(url, headers=self.headers, params=params, verify=certifi.where())
         response.raise_for_status()
         return response.json().get("businesses", [])
 
@@ -49,7 +54,7 @@ class YelpClient:
         :return: Business details as a dictionary
         """
         url = f"{YELP_API_BASE_URL}/businesses/{business_id}"
-        response = requests.get(url, headers=self.headers)
+        response = _SESSION.get(url, headers=self.headers)
         response.raise_for_status()
         return response.json()
     
@@ -1,18 +1,54 @@
 import os
 import time
+import threading
+import functools
 import requests
+from requests.adapters import HTTPAdapter
 import urllib.parse
 from typing import Dict, Any, Optional, List
 import logging
 
 logger = logging.getLogger(__name__)
 
+
+class _TokenBucket:
+    """Thread-safe token bucket used to keep concurrent callers under Zoho's API quota."""
+
+    def __init__(self, rate: float, capacity: Optional[float] = None):
+        self.rate = max(rate, 0.001)
+        self.capacity = capacity if capacity is not None else max(rate, 1.0)
+        self._tokens = self.capacity
+        self._updated_at = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> None:
+        """Block until a token is available, then consume it."""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated_at) * self.rate)
+                self._updated_at = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
+
+
+def _rate_from_env() -> float:
+    try:
+        return float(os.getenv("ZOHO_REQUESTS_PER_SECOND", "10"))
+    except ValueError:
+        return 10.0
+
+
 class ZohoAuth:
     """Handles Zoho OAuth2 authentication and token management."""
 
     # Class-level cache for shared token state across instances
     _shared_access_token: Optional[str] = None
     _shared_token_expires_at: Optional[float] = None
+    _token_lock = threading.Lock()
 
     def __init__(self, client_id: str, client_secret: str, redirect_uri: str, refresh_token: Optional[str] = None, data_center: str = "us"):
         self.client_id = client_id
@@ -37,27 +73,32 @@ class ZohoAuth:
         if not self.refresh_token:
             raise ValueError("No refresh token available. Please complete OAuth authorization first.")
 
-        data = {
-            'grant_type': 'refresh_token',
-            'client_id': self.client_id,
-            'client_secret': self.client_secret,
-            'refresh_token': self.refresh_token
-        }
+        # Serialize refreshes so concurrent workers don't each request a new token
+        with ZohoAuth._token_lock:
+            if ZohoAuth._shared_access_token and ZohoAuth._shared_token_expires_at and time.time() < ZohoAuth._shared_token_expires_at - 60:
+                return ZohoAuth._shared_access_token
 
-        try:
-            response = requests.post(self.auth_url, data=data, timeout=30)
-            response.raise_for_status()
-            token_data = response.json()
+            data = {
+                'grant_type': 'refresh_token',
+                'client_id': self.client_id,
+                'client_secret': self.client_secret,
+                'refresh_token': self.refresh_token
+            }
 
-            ZohoAuth._shared_access_token = token_data['access_token']
-            expires_in = token_data.get('expires_in', 3600)  # Default 1 hour
-            ZohoAuth._shared_token_expires_at = time.time() + expires_in
-
-            logger.info("Successfully refreshed Zoho access token")
-            return ZohoAuth._shared_access_token
-        except requests.RequestException as e:
-            logger.error(f"Failed to refresh Zoho access token: {e}")
-            raise
+            try:
+                response = requests.post(self.auth_url, data=data, timeout=30)
+                response.raise_for_status()
+                token_data = response.json()
+
+                ZohoAuth._shared_access_token = token_data['access_token']
+                expires_in = token_data.get('expires_in', 3600)  # Default 1 hour
+                ZohoAuth._shared_token_expires_at = time.time() + expires_in
+
+                logger.info("Successfully refreshed Zoho access token")
+                return ZohoAuth._shared_access_token
+            except requests.RequestException as e:
+                logger.error(f"Failed to refresh Zoho access token: {e}")
+                raise
 
     def get_authorization_url(self, scope: str = "ZohoCRM.modules.ALL") -> str:
         """Generate the authorization URL for OAuth flow."""
@@ -129,9 +170,16 @@ class ZohoAuth:
 class ZohoCRMClient:
     """Client for Zoho CRM API operations."""
 
+    # Class-level limiter shared across instances and threads (ZOHO_REQUESTS_PER_SECOND, default 10)
+    _rate_limiter = _TokenBucket(_rate_from_env())
+
     def __init__(self, client_id: str, client_secret: str, redirect_uri: str, refresh_token: Optional[str] = None, data_center: str = "us"):
         self.auth = ZohoAuth(client_id, client_secret, redirect_uri, refresh_token, data_center)
         self.base_url = self.auth.base_url
+        # Persistent session so back-to-back calls (and uploads) reuse keep-alive TLS connections
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=16)
+        self.session.mount("https://", adapter)
 
     def _make_request(self, method: str, endpoint: str, data: Optional[Dict] = None, files: Optional[Dict] = None) -> Dict[str, Any]:
         """Make authenticated request to Zoho API."""
@@ -142,8 +190,9 @@ class ZohoCRMClient:
             # For file uploads, don't set Content-Type
             headers.pop('Content-Type', None)
 
+        ZohoCRMClient._rate_limiter.acquire()
         try:
-            response = requests.request(method, url, headers=headers, json=data, files=files, timeout=30)
+            response = self.session.request(method, url, headers=headers, json=data, files=files, timeout=30)
             response.raise_for_status()
             # Handle 204 No Content (e.g., search with no results)
             if response.status_code == 204:
@@ -282,6 +331,15 @@ class ZohoCRMClient:
         response = self._make_request("GET", endpoint)
         return response.get('data', [])
 
+    def create_records(self, module: str, records: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Insert up to 100 records in a single call.
+        Results are in request order; each carries 'status' and, on success, 'details.id'.
+        """
+        endpoint = f"/crm/v2/{module}"
+        response = self._make_request("POST", endpoint, {"data": records})
+        return response.get('data', [])
+
     def search_leads(self, criteria: Dict[str, Any]) -> List[Dict[str, Any]]:
         """Search for leads based on criteria."""
         endpoint = "/crm/v2/Leads/search"
@@ -298,22 +356,33 @@ class ZohoCRMClient:
         response = self._make_request("GET", endpoint)
         return response.get('data', [])
 
-    def search_contacts(self, criteria: Dict[str, Any]) -> List[Dict[str, Any]]:
-        """Search for contacts based on criteria."""
+    def search_contacts(self, criteria: Dict[str, Any], fields: Optional[List[str]] = None, per_page: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Search for contacts based on criteria. Pass fields to have the search return those fields directly."""
         endpoint = "/crm/v2/Contacts/search"
         # Zoho CRM search format: criteria=(field:operator:value)
         criteria_parts = []
         for field, value in criteria.items():
             criteria_parts.append(f"({field}:equals:{value})")
 
+        params = []
         if criteria_parts:
             criteria_str = "or".join(criteria_parts) if len(criteria_parts) > 1 else criteria_parts[0]
-            criteria_str = urllib.parse.quote(criteria_str)
-            endpoint += f"?criteria={criteria_str}"
+            params.append(f"criteria={urllib.parse.quote(criteria_str)}")
+        if fields:
+            params.append(f"fields={urllib.parse.quote(','.join(fields))}")
+        if per_page:
+            params.append(f"per_page={per_page}")
+        if params:
+            endpoint += "?" + "&".join(params)
 
         response = self._make_request("GET", endpoint)
         return response.get('data', [])
 
+    def find_one_contact(self, criteria: Dict[str, Any], fields: Optional[List[str]] = None) -> Optional[Dict[str, Any]]:
+        """Return the first contact matching criteria, asking Zoho for a single record."""
+        contacts = self.search_contacts(criteria, fields=fields, per_page=1)
+        return contacts[0] if contacts else None
+
     def create_account(self, account_data: Dict[str, Any]) -> str:
         """Create a new account in Zoho CRM. Returns the account ID."""
         endpoint = "/crm/v2/Accounts"
@@ -362,8 +431,16 @@ class ZohoCRMClient:
         return response.get('data', [])
 
 
+@functools.lru_cache(maxsize=4)
+def _cached_zoho_client(client_id: str, client_secret: str, redirect_uri: str, refresh_token: Optional[str], data_center: str) -> ZohoCRMClient:
+    return ZohoCRMClient(client_id, client_secret, redirect_uri, refresh_token, data_center)
+
+
 def get_zoho_client() -> ZohoCRMClient:
-    """Factory function to create Zoho client from environment variables."""
+    """
+    Factory function to get a Zoho client from environment variables.
+    Clients are memoized per credential set so their HTTP session (and connection pool) is reused.
+    """
     client_id = os.getenv("ZOHO_CLIENT_ID")
     client_secret = os.getenv("ZOHO_CLIENT_SECRET")
     redirect_uri = os.getenv("ZOHO_REDIRECT_URI")
@@ -375,4 +452,4 @@ def get_zoho_client() -> ZohoCRMClient:
     # Default to US data center, can be overridden with ZOHO_DATA_CENTER env var
     data_center = os.getenv("ZOHO_DATA_CENTER", "us")
 
-    return ZohoCRMClient(client_id, client_secret, redirect_uri, refresh_token, data_center)
\ No newline at end of file
+    return _cached_zoho_client(client_id, client_secret, redirect_uri, refresh_token, data_center)
\ No newline at end of file
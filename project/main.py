@@ -12,7 +12,7 @@ from project.helpers.integration import (
     normalize_for_supabase,
     upsert_businesses,
 )
-from project.helpers.zoho_integration import create_zoho_lead_for_business, attach_image_to_lead
+from project.helpers.zoho_integration import create_zoho_leads_bulk, attach_image_to_lead
 from project.helpers.crawler import normalize_homepage_url
 from project.libs.yelp_client import YelpClient
 # from project.libs.google_client import GoogleClient
@@ -85,15 +85,17 @@ def main():
         upsert_businesses(businesses)
         logging.info("Upserted businesses into Supabase successfully")
 
-        # Create Zoho CRM leads for each business
+        # Create Zoho CRM leads for each business (concurrently, rate-limited by the Zoho client)
+        lead_ids = create_zoho_leads_bulk(businesses)
         for biz in businesses:
+            lead_id = lead_ids.get(biz.get('id'))
+            if not lead_id:
+                continue
             try:
-                lead_id = create_zoho_lead_for_business(biz)
-                if lead_id:
-                    # Attach business image to the lead
-                    attach_image_to_lead(biz['id'], lead_id)
+                # Attach business image to the lead
+                attach_image_to_lead(biz['id'], lead_id)
             except Exception as e:
-                logging.error(f"Failed to create Zoho lead for business {biz.get('id')}: {e}")
+                logging.error(f"Failed to attach image to Zoho lead for business {biz.get('id')}: {e}")
         logging.info("Created Zoho CRM leads for businesses")
 
         # Run business_pages pipeline for each business that has a website
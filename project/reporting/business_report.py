@@ -420,8 +420,8 @@ def _build_heatmap_map_url(center_lat: float, center_lng: float, category: str,
     center_px, center_py = _latlng_to_pixel_xy(center_lat, center_lng, zoom)
 
     # For each grid position, search for competitors and find rank
-    from project.libs.google_client import GoogleClient
-    client = GoogleClient()
+    from project.libs.google_client import get_default_client
+    client = get_default_client()
     ranks: List[Optional[int]] = []
     competitors_per_point: List[List[Dict[str, Any]]] = []
 
@@ -1223,7 +1223,7 @@ def generateBusinessReportPdf(business_id: str, to_path: Optional[str] = None, u
                     lead = client.get_lead(lead_id)
                     if lead and not lead.get('Description'):
                         update_lead(lead_id, {"Description": editorial_summary})
-                attach_pdf_to_lead(lead_id, to_path, "Business Report")
+                attach_pdf_to_lead(lead_id, to_path, "Business Report", business_name)
             else:
                 logger.info(f"Business Report already exists for lead {lead_id}, skipping attachment and description update")
     except Exception as e:
@@ -1282,7 +1282,7 @@ def generateBusinessRankLocalReportPdf(business_id: str, to_path: Optional[str]
         lead_id = get_lead_id_by_business_id(business_id)
         if lead_id:
             if not check_report_attachment_exists(lead_id, "Visibility Report", business_name):
-                attach_pdf_to_lead(lead_id, to_path, "Visibility Report")
+                attach_pdf_to_lead(lead_id, to_path, "Visibility Report", business_name)
             else:
                 logger.info(f"Visibility Report already exists for lead {lead_id}, skipping attachment")
     except Exception as e:
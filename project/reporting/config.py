@@ -49,6 +49,8 @@ class ReportConfig:
     CLASSIFIER_TOPK: int
     CLASSIFIER_CONFIDENCE_MARGIN: float
     CLASSIFIER_CACHE_SIZE: int
+    CLASSIFIER_DTYPE: str
+    CLASSIFIER_MAX_IMAGE_BYTES: int
     GOOGLE_PHOTO_MAXWIDTH: int
 
     # PDF-related configuration
@@ -83,6 +85,8 @@ def get_report_config() -> ReportConfig:
         - CLASSIFIER_CONFIDENCE_MARGIN (default "0.10")
         - CLASSIFIER_CACHE_SIZE (default "256")
         - CLASSIFIER_STRICT (default "false")  # if false, auto-disable classifier on init failure
+        - CLASSIFIER_DTYPE (default "float32")  # "bfloat16" halves weight/activation bandwidth on AVX512-BF16/AMX CPUs
+        - CLASSIFIER_MAX_IMAGE_BYTES (default "10485760")  # photo downloads larger than this are skipped
         - GOOGLE_PHOTO_MAXWIDTH (default "800")
         - PDF_ENGINE (default "playwright")
         - PDF_FORMAT (default "A4")
@@ -130,6 +134,11 @@ def get_report_config() -> ReportConfig:
         classifier_cache_size = int(os.getenv("CLASSIFIER_CACHE_SIZE", "256"))
     except ValueError:
         classifier_cache_size = 256
+    classifier_dtype = os.getenv("CLASSIFIER_DTYPE", "float32").strip().lower()
+    try:
+        classifier_max_image_bytes = int(os.getenv("CLASSIFIER_MAX_IMAGE_BYTES", "10485760"))
+    except ValueError:
+        classifier_max_image_bytes = 10485760
     try:
         google_photo_maxwidth = int(os.getenv("GOOGLE_PHOTO_MAXWIDTH", "800"))
     except ValueError:
@@ -175,6 +184,8 @@ def get_report_config() -> ReportConfig:
         CLASSIFIER_TOPK=classifier_topk,
         CLASSIFIER_CONFIDENCE_MARGIN=classifier_conf_margin,
         CLASSIFIER_CACHE_SIZE=classifier_cache_size,
+        CLASSIFIER_DTYPE=classifier_dtype,
+        CLASSIFIER_MAX_IMAGE_BYTES=classifier_max_image_bytes,
         GOOGLE_PHOTO_MAXWIDTH=google_photo_maxwidth,
         # PDF and storage
         PDF_ENGINE=pdf_engine,  # type: ignore[arg-type]
@@ -13,9 +13,10 @@ from project.reporting.config import get_report_config
 
 try:
     # Optional import; tests can mock GoogleClient usage
-    from project.libs.google_client import GoogleClient  # type: ignore
+    from project.libs.google_client import GoogleClient, get_default_client  # type: ignore
 except Exception:  # pragma: no cover - fallback if client import fails
     GoogleClient = None  # type: ignore
+    get_default_client = None  # type: ignore
 
 
 AddressDict = Dict[str, Optional[str]]
@@ -145,7 +146,7 @@ def geocodeAddressToCoords(address: AddressDict) -> Dict[str, Optional[float]]:
     api_key = cfg.GOOGLE_API_KEY
     if GoogleClient and api_key:
         try:
-            gc = GoogleClient(api_key)
+            gc = get_default_client(api_key)
             results = gc.client.geocode(line)
             if results:
                 # Prefer 'geometry.location'
@@ -291,7 +291,7 @@ def generateWebsiteReportPdf(business_id: str, to_path: str | None = None, uploa
             logger.info(f"Website Report attachment exists for lead {lead_id}: {exists}")
             if not exists:
                 logger.info(f"Attaching Website Report PDF to lead {lead_id}")
-                success = attach_pdf_to_lead(lead_id, to_path, "Website Report")
+                success = attach_pdf_to_lead(lead_id, to_path, "Website Report", business_name)
                 if success:
                     logger.info(f"Successfully attached Website Report PDF to lead {lead_id}")
                 else: